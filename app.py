@@ -3,13 +3,32 @@ import boto3
 import socket
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import io
+import re
+import gzip
+import hashlib
+import ssl
+import asyncio
 import base64
 import os
+import sys
+import json
+import uuid
+import queue
+import heapq
+import random
+import itertools
+import fnmatch
+import bisect
+import sqlite3
+from contextlib import contextmanager
+import select
+import urllib.request
+from collections import deque
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -24,6 +43,26 @@ except ImportError:
     print("⚠️  WeasyPrint not installed. Install with: pip install weasyprint")
     USE_WEASYPRINT = False
 
+# dnspython powers the authoritative probe mode
+try:
+    import dns.flags
+    import dns.message
+    import dns.query
+    import dns.rcode
+    import dns.rdatatype
+    USE_DNSPYTHON = True
+except ImportError:
+    print("⚠️  dnspython not installed. Install with: pip install dnspython")
+    USE_DNSPYTHON = False
+
+# aiohttp powers the optional HTTP(S) reachability stage
+try:
+    import aiohttp
+    USE_AIOHTTP = True
+except ImportError:
+    print("⚠️  aiohttp not installed. Install with: pip install aiohttp")
+    USE_AIOHTTP = False
+
 app = Flask(__name__)
 
 # Your AWS credentials
@@ -43,9 +82,172 @@ scan_state = {
     'domains': [],
     'total_zones': 0,
     'processed_zones': 0,
+    'probes_issued': 0,
+    'probes_coalesced': 0,
+    'total_subdomains': 0,
+    'stage': None,
+    'http_total': 0,
+    'http_checked': 0,
+    'scope': None,
     'error': None
 }
 scan_lock = threading.Lock()
+scan_cancel = threading.Event()
+
+# Shared state for multi-process serving (e.g. gunicorn -w 4 app:app). When set,
+# scan progress, results and the distributed work queue live in this SQLite file:
+# one worker owns the scan and every worker serves progress, results and reports
+SHARED_STATE_PATH = None
+SCAN_OWNER_TIMEOUT = 30  # seconds without an owner heartbeat before a scan is considered dead
+SCAN_OWNER_HEARTBEAT = 5
+
+# Every completed scan is saved as a sorted, hashed snapshot for scan-to-scan diffs
+SNAPSHOT_DIR = "/tmp/route53_snapshots"
+SNAPSHOT_ID_PATTERN = re.compile(r'^\d{8}-\d{6}-[0-9a-f]{12}$')
+
+# Checkpoints let an interrupted or cancelled scan resume where it left off
+CHECKPOINT_PATH = "/tmp/route53_scan_checkpoint.json"
+CHECKPOINT_INTERVAL = 30
+
+# Distributed scanning
+# "local" scans every zone with the in-process thread pool, "distributed" shards
+# zones through the work queue to workers started with `python app.py worker <url>`
+SCAN_MODE = "local"
+DISTRIBUTED_LOCAL_WORKERS = 0  # in-process workers started next to the coordinator
+WORKER_CONCURRENCY = 10  # zones probed in parallel by each worker
+WORKER_LEASE_SECONDS = 120
+WORKER_MAX_ATTEMPTS = 3
+WORKER_POLL_INTERVAL = 1
+
+# Zone scheduling
+# Zones run largest first by ResourceRecordSetCount; zones above ZONE_SPLIT_RECORDS
+# are listed page by page and each page of names is probed as its own task
+SCAN_WORKERS = 100
+RECORD_PAGE_SIZE = 300
+ZONE_SPLIT_RECORDS = 1000
+
+# Probe mode
+# "resolver" asks the host's recursive resolver through socket.gethostbyname,
+# "authoritative" sends pipelined UDP queries straight to each zone's Route53 nameservers
+PROBE_MODE = "resolver"
+AUTHORITATIVE_PORT = 53
+AUTHORITATIVE_TIMEOUT = 2
+AUTHORITATIVE_RETRIES = 1
+AUTHORITATIVE_WINDOW = 200  # queries in flight per socket
+AUTHORITATIVE_MAX_REFERRALS = 3  # delegations followed below a zone before falling back to the resolver
+PROBE_SHARE_SECONDS = 300  # a finished probe is reused by other zones for this long
+
+# HTTP(S) reachability stage
+# Names DNS reported as live get a HEAD (or GET when HEAD is refused) request.
+# Can also be enabled per scan with {"http_probe": true}
+HTTP_PROBE_ENABLED = False
+HTTP_PROBE_CONCURRENCY = 500
+HTTP_PROBE_PER_HOST = 4
+HTTP_PROBE_CONNECT_TIMEOUT = 3
+HTTP_PROBE_TIMEOUT = 8
+HTTP_PROBE_SCHEMES = ('https', 'http')
+
+# Continuous monitoring
+# Every known name gets its own re-probe interval: it drops to MONITOR_MIN_INTERVAL
+# when the name flips state and backs off towards MONITOR_MAX_INTERVAL while stable
+MONITOR_MIN_INTERVAL = 60
+MONITOR_MAX_INTERVAL = 3600
+MONITOR_BACKOFF = 2
+MONITOR_WORKERS = 20
+MONITOR_EVENT_LIMIT = 1000
+
+class DomainResult:
+    # Compact per-zone result: subdomains are kept as interned labels relative to
+    # the zone apex plus a bit-packed live mask, and only expanded into the
+    # {'name': ..., 'live': ...} JSON shape at the API boundary
+    __slots__ = ('domain', 'live', '_labels', '_live_bits', 'http', 'pending', 'zone_id')
+
+    def __init__(self, domain, live, subdomains=(), pending=False, zone_id=None):
+        self.domain = sys.intern(domain)
+        self.live = bool(live)
+        # Hosted zone Id; public and private zones can share a name
+        self.zone_id = zone_id
+        # Apex-only placeholder shown while the zone's records are still being probed
+        self.pending = pending
+        suffix = '.' + domain
+        subdomains = sorted(subdomains)
+        labels = []
+        # One bit per subdomain in a bytearray; setting or reading a bit of a
+        # Python int would copy the whole int and make large zones quadratic
+        live_bits = bytearray((len(subdomains) + 7) // 8)
+        for i, (name, sub_live) in enumerate(subdomains):
+            if name.endswith(suffix):
+                labels.append(sys.intern(name[:-len(suffix)]))
+            else:
+                # Names outside the zone keep their full form, marked with a trailing dot
+                labels.append(name + '.')
+            if sub_live:
+                live_bits[i >> 3] |= 1 << (i & 7)
+        self._labels = tuple(labels)
+        self._live_bits = bytes(live_bits)
+        # name -> (status, latency_ms) once the HTTP stage has run
+        self.http = None
+
+    def _expand(self, label):
+        return label[:-1] if label.endswith('.') else label + '.' + self.domain
+
+    def iter_subdomains(self):
+        live_bits = self._live_bits
+        for i, label in enumerate(self._labels):
+            yield self._expand(label), bool(live_bits[i >> 3] >> (i & 7) & 1)
+
+    def subdomain_names(self):
+        return [self._expand(label) for label in self._labels]
+
+    @property
+    def subdomain_count(self):
+        return len(self._labels)
+
+    @property
+    def live_subdomain_count(self):
+        return bin(int.from_bytes(self._live_bits, 'little')).count('1')
+
+    def _entry(self, key, name, live):
+        entry = {key: name, 'live': live}
+        if self.http is not None:
+            entry['http_status'], entry['http_latency_ms'] = self.http.get(name, (None, None))
+        return entry
+
+    def to_dict(self):
+        result = self._entry("domain", self.domain, self.live)
+        result["subdomains"] = [self._entry('name', name, live) for name, live in self.iter_subdomains()]
+        if self.pending:
+            result["pending"] = True
+        if self.zone_id:
+            result["zone_id"] = self.zone_id
+        return result
+
+    def summary(self, preview=8):
+        # Row shape for the results list: counts and a few names, not every subdomain
+        result = self._entry("domain", self.domain, self.live)
+        result["subdomain_count"] = self.subdomain_count
+        result["live_subdomains"] = self.live_subdomain_count
+        result["preview"] = [self._expand(label) for label in itertools.islice(self._labels, preview)]
+        if self.pending:
+            result["pending"] = True
+        return result
+
+    @classmethod
+    def from_dict(cls, data):
+        result = cls(
+            data['domain'],
+            data['live'],
+            [(sub['name'], sub['live']) for sub in data.get('subdomains', [])],
+            pending=data.get('pending', False),
+            zone_id=data.get('zone_id')
+        )
+        if 'http_status' in data:
+            result.http = {
+                entry.get('name', entry.get('domain')): (entry['http_status'], entry.get('http_latency_ms'))
+                for entry in [data] + data.get('subdomains', [])
+                if entry.get('http_status') is not None
+            }
+        return result
 
 def is_live(domain):
     try:
@@ -55,100 +257,1873 @@ def is_live(domain):
     except:
         return False
 
-def scan_single_domain(zone):
-    domain = zone['Name'].rstrip('.')
-    domain_live = is_live(domain)
+nameserver_cache = {}
+nameserver_cache_lock = threading.Lock()
+
+def resolve_nameserver(host):
+    with nameserver_cache_lock:
+        if host in nameserver_cache:
+            return nameserver_cache[host]
+    ip = socket.gethostbyname(host)
+    with nameserver_cache_lock:
+        nameserver_cache[host] = ip
+    return ip
+
+zone_nameserver_cache = {}
+
+def zone_nameservers(zone, client):
+    if zone.get('Config', {}).get('PrivateZone'):
+        return []
+    with nameserver_cache_lock:
+        if zone['Id'] in zone_nameserver_cache:
+            return zone_nameserver_cache[zone['Id']]
+    delegation = client.get_hosted_zone(Id=zone['Id']).get('DelegationSet', {})
+    servers = []
+    for host in delegation.get('NameServers', []):
+        try:
+            servers.append(resolve_nameserver(host))
+        except Exception as e:
+            print(f"Could not resolve nameserver {host}: {e}")
+    with nameserver_cache_lock:
+        zone_nameserver_cache[zone['Id']] = servers
+    return servers
+
+def has_address(response):
+    if response.rcode() != dns.rcode.NOERROR:
+        return False
+    return any(rrset.rdtype in (dns.rdatatype.A, dns.rdatatype.AAAA, dns.rdatatype.CNAME)
+               for rrset in response.answer)
+
+def referral_nameservers(response):
+    # A delegation answer: NOERROR, not authoritative, no answer, NS records in
+    # the authority section. Returns the child zone's nameserver addresses
+    if response.rcode() != dns.rcode.NOERROR or response.flags & dns.flags.AA or response.answer:
+        return None
+    targets = [rdata.target for rrset in response.authority if rrset.rdtype == dns.rdatatype.NS for rdata in rrset]
+    if not targets:
+        return None
+    glue = {}
+    for rrset in response.additional:
+        if rrset.rdtype in (dns.rdatatype.A, dns.rdatatype.AAAA):
+            glue.setdefault(rrset.name, []).extend(rdata.address for rdata in rrset)
+    servers = []
+    for target in targets:
+        if target in glue:
+            servers.extend(glue[target])
+            continue
+        try:
+            servers.append(resolve_nameserver(target.to_text().rstrip('.')))
+        except Exception as e:
+            print(f"Could not resolve nameserver {target}: {e}")
+    return list(dict.fromkeys(servers))
+
+def probe_authoritative(names, nameservers, port=None, timeout=None, cancel=None, depth=0):
+    port = port or AUTHORITATIVE_PORT
+    timeout = timeout or AUTHORITATIVE_TIMEOUT
+    results = {name: False for name in names}
+    pending = deque(results)
+    attempts = {}
+    outstanding = {}
+    truncated = []
+    referrals = {}
+    sockets = {}
+    
+    def answer(name, response):
+        servers = referral_nameservers(response)
+        if servers is None:
+            results[name] = has_address(response)
+        else:
+            referrals.setdefault(tuple(sorted(servers)), []).append(name)
+    
+    def socket_for(server):
+        family = socket.AF_INET6 if ':' in server else socket.AF_INET
+        if family not in sockets:
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            sockets[family] = sock
+        return sockets[family]
+    
+    try:
+        while (pending or outstanding) and not (cancel and cancel.is_set()):
+            while pending and len(outstanding) < AUTHORITATIVE_WINDOW:
+                name = pending.popleft()
+                attempts[name] = attempts.get(name, 0) + 1
+                # Retries rotate to the zone's next nameserver
+                server = nameservers[(attempts[name] - 1) % len(nameservers)]
+                query = dns.message.make_query(name, 'A')
+                while query.id in outstanding:
+                    query.id = random.randint(0, 65535)
+                socket_for(server).sendto(query.to_wire(), (server, port))
+                outstanding[query.id] = (name, query, server, time.time())
+            
+            ready, _, _ = select.select(list(sockets.values()), [], [], 0.05)
+            for sock in ready:
+                while True:
+                    try:
+                        wire = sock.recv(65535)
+                    except OSError:
+                        break
+                    try:
+                        response = dns.message.from_wire(wire)
+                    except Exception:
+                        continue
+                    entry = outstanding.get(response.id)
+                    if not entry or not entry[1].is_response(response):
+                        continue
+                    del outstanding[response.id]
+                    name, _, server, _ = entry
+                    if response.flags & dns.flags.TC:
+                        truncated.append((name, server))
+                    else:
+                        answer(name, response)
+            
+            now = time.time()
+            for query_id, (name, _, _, sent_at) in list(outstanding.items()):
+                if now - sent_at > timeout:
+                    del outstanding[query_id]
+                    if attempts[name] <= AUTHORITATIVE_RETRIES:
+                        pending.append(name)
+    finally:
+        for sock in sockets.values():
+            sock.close()
+    
+    for name, server in truncated:
+        try:
+            response = dns.query.tcp(dns.message.make_query(name, 'A'), server, timeout=timeout, port=port)
+            answer(name, response)
+        except Exception as e:
+            print(f"TCP retry for {name} failed: {e}")
     
-    client = boto3.client(
+    # Names below a delegation are asked again at the child zone's nameservers
+    for servers, delegated in referrals.items():
+        if cancel and cancel.is_set():
+            break
+        if servers and depth < AUTHORITATIVE_MAX_REFERRALS:
+            results.update(probe_authoritative(delegated, list(servers), port, timeout, cancel, depth + 1))
+        else:
+            for name in delegated:
+                results[name] = is_live(name)
+    
+    return results
+
+class ProbeTable:
+    # Scan-wide table of in-flight and recent probes. Delegated subzones show up
+    # in both the parent and the child zone, so a name claimed by one worker is
+    # awaited by the others instead of being queried again
+    def __init__(self, share_seconds=PROBE_SHARE_SECONDS):
+        self.share_seconds = share_seconds
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._entries = {}
+            self._next_sweep = time.time() + self.share_seconds
+            self.issued = 0
+            self.coalesced = 0
+
+    def _sweep_locked(self, now):
+        # Long-lived processes (remote workers) never reset the table, so
+        # answers older than the sharing window are dropped periodically
+        self._next_sweep = now + self.share_seconds
+        expired = [key for key, entry in self._entries.items()
+                   if entry['finished'] is not None and now - entry['finished'] > self.share_seconds]
+        for key in expired:
+            del self._entries[key]
+
+    def resolve(self, names, probe, source=None):
+        # `source` names how the answer was obtained; answers are only shared
+        # between callers that would have asked the same way
+        owned = []
+        shared = []
+        with self._lock:
+            now = time.time()
+            if now >= self._next_sweep:
+                self._sweep_locked(now)
+            for name in names:
+                key = (name.lower(), source)
+                entry = self._entries.get(key)
+                if entry and (entry['finished'] is None or now - entry['finished'] <= self.share_seconds):
+                    shared.append((name, entry))
+                    self.coalesced += 1
+                else:
+                    self._entries[key] = {'event': threading.Event(), 'live': False, 'finished': None, 'failed': False}
+                    owned.append(name)
+                    self.issued += 1
+        
+        results = {}
+        failed = True
+        try:
+            if owned:
+                results = probe(owned)
+            failed = False
+        finally:
+            with self._lock:
+                finished = time.time()
+                for name in owned:
+                    key = (name.lower(), source)
+                    entry = self._entries[key]
+                    entry['live'] = results.get(name, False)
+                    entry['finished'] = finished
+                    entry['failed'] = failed
+                    if failed:
+                        # A cancelled or failed probe is not an answer to share
+                        del self._entries[key]
+                    entry['event'].set()
+        
+        retry = []
+        for name, entry in shared:
+            entry['event'].wait()
+            if entry['failed']:
+                retry.append(name)
+            else:
+                results[name] = entry['live']
+        if retry:
+            results.update(self.resolve(retry, probe, source))
+        return results
+
+probe_table = ProbeTable()
+
+class ScanCancelled(Exception):
+    pass
+
+def probe_names(zone, names, client, cancel=None, shared=True):
+    cancel = cancel or scan_cancel
+    nameservers = zone_nameservers(zone, client) if PROBE_MODE == "authoritative" and USE_DNSPYTHON else []
+    
+    def probe(owned):
+        if nameservers:
+            results = probe_authoritative(owned, nameservers, cancel=cancel)
+            if cancel.is_set():
+                raise ScanCancelled()
+            return results
+        results = {}
+        for name in owned:
+            if cancel.is_set():
+                raise ScanCancelled()
+            results[name] = is_live(name)
+        return results
+    
+    names = list(dict.fromkeys(names))
+    # The monitor re-probes on purpose, so it skips the scan-wide probe table
+    if not shared:
+        return probe(names)
+    # Authoritative probes follow referrals to the child zone, so a parent and a
+    # delegated child get the same answer and share by name; resolver answers
+    # (private zones) are kept apart from authoritative ones
+    return probe_table.resolve(names, probe, 'authoritative' if nameservers else 'resolver')
+
+def get_route53_client():
+    return boto3.client(
         'route53',
         region_name='us-east-1',
         aws_access_key_id=AWS_ACCESS_KEY_ID,
         aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
         aws_session_token=AWS_SESSION_TOKEN
     )
+
+RECORD_TYPES = {
+    'A', 'AAAA', 'CAA', 'CNAME', 'DS', 'HTTPS', 'MX', 'NAPTR', 'NS',
+    'PTR', 'SOA', 'SPF', 'SRV', 'SSHFP', 'SVCB', 'TLSA', 'TXT'
+}
+ZONE_TYPES = {'all', 'public', 'private'}
+
+def parse_scan_scope(data):
+    def as_list(value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = value.split(',')
+        return [str(v).strip() for v in value if str(v).strip()]
     
-    records = client.list_resource_record_sets(
-        HostedZoneId=zone['Id'],
-        MaxItems='50'
-    )
+    zone_type = (data.get('zone_type') or 'all').lower()
+    if zone_type not in ZONE_TYPES:
+        raise ValueError(f"zone_type must be one of: {', '.join(sorted(ZONE_TYPES))}")
     
-    subdomains = []
-    for rec in records['ResourceRecordSets']:
-        name = rec['Name'].rstrip('.')
-        if name != domain:
-            subdomains.append({
-                'name': name,
-                'live': is_live(name)
-            })
+    record_types = [t.upper() for t in as_list(data.get('record_types'))]
+    unknown = [t for t in record_types if t not in RECORD_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown record types: {', '.join(unknown)}")
     
     return {
-        "domain": domain,
-        "live": domain_live,
-        "subdomains": sorted(subdomains, key=lambda x: x['name'])
+        'zone_ids': [z.split('/')[-1] for z in as_list(data.get('zone_ids'))],
+        'zone_patterns': [p.lower().rstrip('.') for p in as_list(data.get('zone_patterns'))],
+        'zone_type': zone_type,
+        'record_types': record_types,
+        'http_probe': bool(data.get('http_probe', HTTP_PROBE_ENABLED))
     }
 
-def background_scan():
-    global scan_state
+def zone_in_scope(zone, scope):
+    if not scope:
+        return True
+    
+    private = zone.get('Config', {}).get('PrivateZone', False)
+    if scope['zone_type'] == 'public' and private:
+        return False
+    if scope['zone_type'] == 'private' and not private:
+        return False
+    
+    if not scope['zone_ids'] and not scope['zone_patterns']:
+        return True
+    if zone['Id'].split('/')[-1] in scope['zone_ids']:
+        return True
+    name = zone['Name'].rstrip('.').lower()
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in scope['zone_patterns'])
+
+def record_in_scope(rec, scope):
+    return not scope or not scope['record_types'] or rec['Type'] in scope['record_types']
+
+def zone_size(zone):
+    return zone.get('ResourceRecordSetCount', 0)
+
+def list_hosted_zones(client):
+    zones = []
+    for page in client.get_paginator('list_hosted_zones').paginate():
+        zones.extend(page['HostedZones'])
+    return zones
+
+def iter_record_pages(zone, client):
+    kwargs = {'HostedZoneId': zone['Id'], 'MaxItems': str(RECORD_PAGE_SIZE)}
+    while True:
+        page = client.list_resource_record_sets(**kwargs)
+        yield page['ResourceRecordSets']
+        if not page.get('IsTruncated'):
+            return
+        kwargs['StartRecordName'] = page['NextRecordName']
+        kwargs['StartRecordType'] = page['NextRecordType']
+        if page.get('NextRecordIdentifier'):
+            kwargs['StartRecordIdentifier'] = page['NextRecordIdentifier']
+
+def record_names(records, domain, scope):
+    names = []
+    for rec in records:
+        name = rec['Name'].rstrip('.')
+        if name != domain and record_in_scope(rec, scope):
+            names.append(name)
+    return names
+
+def scan_single_domain(zone, scope=None, client=None, cancel=None, probe_apex=True):
+    domain = zone['Name'].rstrip('.')
+    
+    client = client or get_route53_client()
+    
+    names = []
+    for records in iter_record_pages(zone, client):
+        names.extend(record_names(records, domain, scope))
+    
+    # Without probe_apex the caller already has the apex result and `live` is None
+    liveness = probe_names(zone, [domain] + names if probe_apex else names, client, cancel)
+    return DomainResult(domain, liveness.get(domain), [(name, liveness[name]) for name in names], zone_id=zone['Id'])
+
+class ZoneWorkQueue:
+    def __init__(self, lease_seconds=WORKER_LEASE_SECONDS, max_attempts=WORKER_MAX_ATTEMPTS):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._results = queue.Queue()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._pending = deque()
+            self._leases = {}
+            self._expired = {}
+            self._attempts = {}
+            self._done = set()
+            self._scope = None
+            self._results = queue.Queue()
+
+    def put(self, zones, scope=None):
+        with self._lock:
+            self._scope = scope
+            self._pending.extend(zones)
+
+    def lease(self, worker_id):
+        with self._lock:
+            self._requeue_expired_locked()
+            while self._pending:
+                zone = self._pending.popleft()
+                if zone['Id'] in self._done:
+                    continue
+                lease_id = uuid.uuid4().hex
+                self._leases[lease_id] = {
+                    'zone': zone,
+                    'worker_id': worker_id,
+                    'expires': time.time() + self.lease_seconds
+                }
+                self._attempts[zone['Id']] = self._attempts.get(zone['Id'], 0) + 1
+                return {
+                    'lease_id': lease_id,
+                    'zone': zone,
+                    'scope': self._scope,
+                    'lease_seconds': self.lease_seconds
+                }
+        return None
+
+    def heartbeat(self, lease_id):
+        with self._lock:
+            lease = self._leases.get(lease_id)
+            if not lease:
+                return False
+            lease['expires'] = time.time() + self.lease_seconds
+            return True
+
+    def complete(self, lease_id, result):
+        with self._lock:
+            lease = self._leases.pop(lease_id, None) or self._expired.pop(lease_id, None)
+            if not lease:
+                return False
+            zone_id = lease['zone']['Id']
+            if zone_id in self._done:
+                return False
+            self._done.add(zone_id)
+        # A zone can be handed out again after its lease expired; whichever
+        # worker reports first wins and the other copy is dropped here
+        self._results.put((zone_id, result, None))
+        return True
+
+    def fail(self, lease_id, error):
+        with self._lock:
+            lease = self._leases.pop(lease_id, None)
+            if not lease:
+                return False
+            zone = lease['zone']
+            if zone['Id'] in self._done:
+                return False
+            if self._attempts.get(zone['Id'], 0) < self.max_attempts:
+                self._pending.append(zone)
+                return True
+            self._done.add(zone['Id'])
+        self._results.put((zone['Id'], None, error))
+        return True
+
+    def requeue_expired(self):
+        with self._lock:
+            return self._requeue_expired_locked()
+
+    def _requeue_expired_locked(self):
+        now = time.time()
+        expired = [lease_id for lease_id, lease in self._leases.items() if lease['expires'] < now]
+        for lease_id in expired:
+            lease = self._leases.pop(lease_id)
+            self._expired[lease_id] = lease
+            zone = lease['zone']
+            if zone['Id'] in self._done:
+                continue
+            if self._attempts.get(zone['Id'], 0) >= self.max_attempts:
+                print(f"Lease on {zone['Name']} expired {self.max_attempts} times, giving up")
+                self._done.add(zone['Id'])
+                self._results.put((zone['Id'], None, f"Lease expired {self.max_attempts} times"))
+            else:
+                print(f"Lease on {zone['Name']} held by {lease['worker_id']} expired, reassigning")
+                self._pending.appendleft(zone)
+        return len(expired)
+
+    def get_result(self, timeout=None):
+        return self._results.get(timeout=timeout)
+
+def process_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class SharedScanStore:
+    RESULT_ORDER = {
+        'name': 'name_key, seq',
+        '-name': 'name_key DESC, seq DESC',
+        'live': 'live DESC, name_key, seq',
+        'dead': 'live, name_key, seq',
+        'subdomains': 'subdomain_count DESC, name_key, seq'
+    }
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS scan_meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS domains (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                name_key TEXT NOT NULL,
+                live INTEGER NOT NULL,
+                subdomain_count INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                pending INTEGER NOT NULL DEFAULT 0,
+                domain TEXT,
+                live_subdomains INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS domains_name ON domains (name_key);
+            CREATE INDEX IF NOT EXISTS domains_live_name ON domains (live, name_key);
+            CREATE INDEX IF NOT EXISTS domains_subdomains ON domains (subdomain_count);
+            CREATE TABLE IF NOT EXISTS work_items (
+                zone_id TEXT PRIMARY KEY,
+                zone TEXT NOT NULL,
+                state TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                lease_id TEXT,
+                worker_id TEXT,
+                expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS work_items_pending ON work_items (state, position);
+            CREATE TABLE IF NOT EXISTS work_leases (lease_id TEXT PRIMARY KEY, zone_id TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS work_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                zone_id TEXT NOT NULL,
+                result TEXT,
+                error TEXT
+            );
+        """)
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(domains)')]
+        for column, definition in (('pending', 'INTEGER NOT NULL DEFAULT 0'), ('domain', 'TEXT'),
+                                   ('live_subdomains', 'INTEGER NOT NULL DEFAULT 0')):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE domains ADD COLUMN {column} {definition}')
+
+    def _conn(self):
+        # One connection per thread and per process, so forked WSGI workers never share one
+        if getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return self._local.conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _set_meta(self, conn, values):
+        conn.executemany(
+            'INSERT OR REPLACE INTO scan_meta (key, value) VALUES (?, ?)',
+            [(key, json.dumps(value)) for key, value in values.items()]
+        )
+
+    def set_meta(self, values):
+        with self.transaction() as conn:
+            self._set_meta(conn, values)
+
+    def get_meta(self):
+        rows = self._conn().execute('SELECT key, value FROM scan_meta').fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def claim_scan(self, owner):
+        with self.transaction() as conn:
+            meta = dict(conn.execute('SELECT key, value FROM scan_meta').fetchall())
+            status = json.loads(meta.get('status', '"idle"'))
+            heartbeat = json.loads(meta.get('owner_heartbeat', '0'))
+            if status == 'scanning' and time.time() - heartbeat < SCAN_OWNER_TIMEOUT:
+                return False
+            # Apex rows a dead owner never finished are not part of any scan
+            conn.execute('DELETE FROM domains WHERE pending = 1')
+            self._set_meta(conn, {
+                'status': 'scanning',
+                'owner': owner,
+                'owner_heartbeat': time.time(),
+                'cancel_requested': False
+            })
+            return True
+
+    def heartbeat(self, owner):
+        with self.transaction() as conn:
+            self._set_meta(conn, {'owner': owner, 'owner_heartbeat': time.time()})
+
+    def _insert_result(self, conn, result):
+        return conn.execute(
+            'INSERT INTO domains (name_key, live, subdomain_count, payload, pending, domain, live_subdomains) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (result.domain.lower(), int(result.live), result.subdomain_count,
+             json.dumps(result.to_dict()), int(result.pending), result.domain, result.live_subdomain_count)
+        ).lastrowid
+
+    def add_partial(self, result):
+        with self.transaction() as conn:
+            return self._insert_result(conn, result)
+
+    def delete_result(self, seq):
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM domains WHERE seq = ?', (seq,))
+
+    def add_result(self, result, meta, replaces=None):
+        with self.transaction() as conn:
+            if replaces:
+                conn.execute('DELETE FROM domains WHERE seq = ?', (replaces,))
+            self._insert_result(conn, result)
+            self._set_meta(conn, meta)
+
+    def replace_results(self, domains):
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM domains')
+            for result in domains:
+                self._insert_result(conn, result)
+
+    def load_results(self):
+        rows = self._conn().execute('SELECT payload FROM domains WHERE pending = 0 ORDER BY seq').fetchall()
+        return [DomainResult.from_dict(json.loads(payload)) for (payload,) in rows]
+
+    def find_results(self, name, include_pending=True):
+        rows = self._conn().execute(
+            'SELECT payload FROM domains WHERE name_key = ?' + ('' if include_pending else ' AND pending = 0')
+            + ' ORDER BY seq', (name.lower(),)
+        ).fetchall()
+        return [DomainResult.from_dict(json.loads(payload)) for (payload,) in rows]
+
+    def load_stats(self):
+        stats = ScanStats()
+        rows = self._conn().execute(
+            'SELECT COALESCE(domain, name_key), live, subdomain_count, live_subdomains '
+            'FROM domains WHERE pending = 0 ORDER BY seq'
+        )
+        for row in rows:
+            stats.add_zone(*row)
+        return stats
+
+    def query_results(self, q='', status='all', sort='name', page=1, limit=50, include_pending=True):
+        where = [] if include_pending else ['pending = 0']
+        params = []
+        if q:
+            escaped = q.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            where.append("name_key LIKE ? ESCAPE '\\'")
+            params.append(f'%{escaped}%')
+        if status != 'all':
+            where.append('live = ?')
+            params.append(int(status == 'live'))
+        clause = ' WHERE ' + ' AND '.join(where) if where else ''
+        conn = self._conn()
+        total = conn.execute('SELECT COUNT(*) FROM domains' + clause, params).fetchone()[0]
+        rows = conn.execute(
+            f'SELECT payload FROM domains{clause} ORDER BY {self.RESULT_ORDER[sort]} LIMIT ? OFFSET ?',
+            params + [limit, (page - 1) * limit]
+        ).fetchall()
+        return total, [DomainResult.from_dict(json.loads(payload)) for (payload,) in rows]
+
+class SqliteWorkQueue:
+    # ZoneWorkQueue backed by the shared store, so lease/complete requests from
+    # remote workers can land on any WSGI worker process
+    def __init__(self, store, lease_seconds=WORKER_LEASE_SECONDS, max_attempts=WORKER_MAX_ATTEMPTS):
+        self.store = store
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._cursor = 0
+
+    def reset(self):
+        with self.store.transaction() as conn:
+            conn.execute('DELETE FROM work_items')
+            conn.execute('DELETE FROM work_leases')
+            conn.execute('DELETE FROM work_results')
+            self.store._set_meta(conn, {'work_scope': None})
+
+    def put(self, zones, scope=None):
+        with self.store.transaction() as conn:
+            start = conn.execute('SELECT COALESCE(MAX(position), 0) FROM work_items').fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO work_items (zone_id, zone, state, position) VALUES (?, ?, 'pending', ?)",
+                [(zone['Id'], json.dumps(zone), start + i + 1) for i, zone in enumerate(zones)]
+            )
+            self.store._set_meta(conn, {'work_scope': scope})
+
+    def _requeue_expired(self, conn):
+        expired = conn.execute(
+            "SELECT zone_id, zone, worker_id, attempts FROM work_items WHERE state = 'leased' AND expires < ?",
+            (time.time(),)
+        ).fetchall()
+        for zone_id, zone, worker_id, attempts in expired:
+            if attempts >= self.max_attempts:
+                print(f"Lease on {json.loads(zone)['Name']} expired {attempts} times, giving up")
+                conn.execute("UPDATE work_items SET state = 'done' WHERE zone_id = ?", (zone_id,))
+                conn.execute(
+                    'INSERT INTO work_results (zone_id, error) VALUES (?, ?)',
+                    (zone_id, f"Lease expired {attempts} times")
+                )
+                continue
+            print(f"Lease on {json.loads(zone)['Name']} held by {worker_id} expired, reassigning")
+            first = conn.execute('SELECT COALESCE(MIN(position), 0) FROM work_items').fetchone()[0]
+            conn.execute(
+                "UPDATE work_items SET state = 'pending', lease_id = NULL, position = ? WHERE zone_id = ?",
+                (first - 1, zone_id)
+            )
+        return len(expired)
+
+    def requeue_expired(self):
+        with self.store.transaction() as conn:
+            return self._requeue_expired(conn)
+
+    def lease(self, worker_id):
+        with self.store.transaction() as conn:
+            self._requeue_expired(conn)
+            row = conn.execute(
+                "SELECT zone_id, zone FROM work_items WHERE state = 'pending' ORDER BY position LIMIT 1"
+            ).fetchone()
+            if not row:
+                return None
+            zone_id, zone = row
+            lease_id = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE work_items SET state = 'leased', lease_id = ?, worker_id = ?, expires = ?, "
+                "attempts = attempts + 1 WHERE zone_id = ?",
+                (lease_id, worker_id, time.time() + self.lease_seconds, zone_id)
+            )
+            conn.execute('INSERT INTO work_leases (lease_id, zone_id) VALUES (?, ?)', (lease_id, zone_id))
+            scope = conn.execute("SELECT value FROM scan_meta WHERE key = 'work_scope'").fetchone()
+            return {
+                'lease_id': lease_id,
+                'zone': json.loads(zone),
+                'scope': json.loads(scope[0]) if scope else None,
+                'lease_seconds': self.lease_seconds
+            }
+
+    def heartbeat(self, lease_id):
+        with self.store.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE work_items SET expires = ? WHERE lease_id = ? AND state = 'leased'",
+                (time.time() + self.lease_seconds, lease_id)
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, lease_id, result):
+        with self.store.transaction() as conn:
+            row = conn.execute(
+                'SELECT i.zone_id, i.state FROM work_leases l JOIN work_items i ON i.zone_id = l.zone_id '
+                'WHERE l.lease_id = ?', (lease_id,)
+            ).fetchone()
+            if not row or row[1] == 'done':
+                return False
+            conn.execute("UPDATE work_items SET state = 'done' WHERE zone_id = ?", (row[0],))
+            conn.execute(
+                'INSERT INTO work_results (zone_id, result) VALUES (?, ?)',
+                (row[0], json.dumps(result.to_dict()))
+            )
+            return True
+
+    def fail(self, lease_id, error):
+        with self.store.transaction() as conn:
+            row = conn.execute(
+                "SELECT zone_id, attempts FROM work_items WHERE lease_id = ? AND state = 'leased'", (lease_id,)
+            ).fetchone()
+            if not row:
+                return False
+            zone_id, attempts = row
+            if attempts < self.max_attempts:
+                last = conn.execute('SELECT COALESCE(MAX(position), 0) FROM work_items').fetchone()[0]
+                conn.execute(
+                    "UPDATE work_items SET state = 'pending', lease_id = NULL, position = ? WHERE zone_id = ?",
+                    (last + 1, zone_id)
+                )
+            else:
+                conn.execute("UPDATE work_items SET state = 'done' WHERE zone_id = ?", (zone_id,))
+                conn.execute('INSERT INTO work_results (zone_id, error) VALUES (?, ?)', (zone_id, error))
+            return True
+
+    def get_result(self, timeout=None):
+        deadline = time.time() + (timeout or 0)
+        while True:
+            row = self.store._conn().execute(
+                'SELECT id, zone_id, result, error FROM work_results WHERE id > ? ORDER BY id LIMIT 1',
+                (self._cursor,)
+            ).fetchone()
+            if row:
+                self._cursor = row[0]
+                result = DomainResult.from_dict(json.loads(row[2])) if row[2] else None
+                return row[1], result, row[3]
+            if time.time() >= deadline:
+                raise queue.Empty()
+            time.sleep(0.2)
+
+shared_store = SharedScanStore(SHARED_STATE_PATH) if SHARED_STATE_PATH else None
+work_queue = SqliteWorkQueue(shared_store) if shared_store else ZoneWorkQueue()
+
+def update_scan_state(changes):
     with scan_lock:
-        scan_state.update({
-            'status': 'scanning',
-            'domains': [],
-            'total_zones': 0,
-            'processed_zones': 0,
-            'error': None
-        })
+        scan_state.update(changes)
+        if shared_store:
+            shared_store.set_meta({key: value for key, value in changes.items() if key != 'domains'})
+
+def read_scan_state(include_domains=True):
+    if shared_store:
+        meta = shared_store.get_meta()
+        state = {key: meta.get(key, value) for key, value in scan_state.items() if key != 'domains'}
+        if state['status'] == 'scanning' and time.time() - meta.get('owner_heartbeat', 0) >= SCAN_OWNER_TIMEOUT:
+            # The owning process died mid-scan; it can be started again or resumed
+            state['status'] = 'interrupted'
+        if include_domains:
+            state['domains'] = shared_store.load_results()
+        return state
     
-    try:
-        client = boto3.client(
-            'route53',
-            region_name='us-east-1',
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            aws_session_token=AWS_SESSION_TOKEN
+    with scan_lock:
+        state = {key: value for key, value in scan_state.items() if key != 'domains'}
+        if include_domains:
+            state['domains'] = scan_state['domains'].copy()
+    return state
+
+def snapshot_domains():
+    return read_scan_state()['domains']
+
+def watch_shared_scan(done):
+    owner = process_id()
+    while not done.wait(SCAN_OWNER_HEARTBEAT):
+        try:
+            shared_store.heartbeat(owner)
+            if shared_store.get_meta().get('cancel_requested'):
+                scan_cancel.set()
+        except Exception as e:
+            print(f"Shared state heartbeat error: {e}")
+
+class LocalQueueClient:
+    def __init__(self, work_queue):
+        self.work_queue = work_queue
+
+    def lease(self, worker_id):
+        return self.work_queue.lease(worker_id)
+
+    def heartbeat(self, lease_id):
+        return self.work_queue.heartbeat(lease_id)
+
+    def complete(self, lease_id, result):
+        return self.work_queue.complete(lease_id, result)
+
+    def fail(self, lease_id, error):
+        return self.work_queue.fail(lease_id, error)
+
+class HttpQueueClient:
+    def __init__(self, coordinator_url, timeout=30):
+        self.coordinator_url = coordinator_url.rstrip('/')
+        self.timeout = timeout
+
+    def _post(self, path, payload):
+        req = urllib.request.Request(
+            self.coordinator_url + path,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
         )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read().decode('utf-8'))
+
+    def lease(self, worker_id):
+        return self._post('/api/worker/lease', {'worker_id': worker_id}).get('task')
+
+    def heartbeat(self, lease_id):
+        return self._post('/api/worker/heartbeat', {'lease_id': lease_id}).get('ok', False)
+
+    def complete(self, lease_id, result):
+        return self._post('/api/worker/complete', {'lease_id': lease_id, 'result': result.to_dict()}).get('ok', False)
+
+    def fail(self, lease_id, error):
+        return self._post('/api/worker/fail', {'lease_id': lease_id, 'error': error}).get('ok', False)
+
+def process_leased_zone(client, task):
+    done = threading.Event()
+    # Set when the lease is lost (expired, or the scan was cancelled and the
+    # queue reset) so the probe loop stops working on a zone it no longer owns
+    abort = threading.Event()
+
+    def keep_alive():
+        next_beat = time.time() + task['lease_seconds'] / 3
+        while not done.wait(1):
+            if scan_cancel.is_set():
+                abort.set()
+                return
+            if time.time() < next_beat:
+                continue
+            next_beat = time.time() + task['lease_seconds'] / 3
+            try:
+                if not client.heartbeat(task['lease_id']):
+                    print(f"Lease on {task['zone']['Name']} lost, abandoning zone")
+                    abort.set()
+                    return
+            except Exception as e:
+                print(f"Heartbeat error: {e}")
+
+    def report(send, *args):
+        # An unreachable coordinator must not kill the worker; the lease simply
+        # expires and the zone is handed out again
+        try:
+            send(task['lease_id'], *args)
+        except Exception as e:
+            print(f"Could not report {task['zone']['Name']} to coordinator: {e}")
+
+    threading.Thread(target=keep_alive, daemon=True).start()
+    try:
+        result = scan_single_domain(task['zone'], task.get('scope'), cancel=abort)
+    except ScanCancelled:
+        pass
+    except Exception as e:
+        print(f"Error scanning domain {task['zone']['Name']}: {e}")
+        report(client.fail, str(e))
+    else:
+        report(client.complete, result)
+    finally:
+        done.set()
+
+def worker_loop(client, worker_id, stop_event):
+    while not stop_event.is_set():
+        try:
+            task = client.lease(worker_id)
+        except Exception as e:
+            print(f"Worker {worker_id} lease error: {e}")
+            task = None
+        if not task:
+            stop_event.wait(WORKER_POLL_INTERVAL)
+            continue
+        try:
+            process_leased_zone(client, task)
+        except Exception as e:
+            print(f"Worker {worker_id} error: {e}")
+
+def run_worker(client, worker_id=None, concurrency=WORKER_CONCURRENCY, stop_event=None):
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    stop_event = stop_event or threading.Event()
+    threads = [
+        threading.Thread(target=worker_loop, args=(client, f"{worker_id}-{i}", stop_event), daemon=True)
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+local_workers_started = False
+
+def start_local_workers():
+    global local_workers_started
+    if local_workers_started or DISTRIBUTED_LOCAL_WORKERS <= 0:
+        return
+    local_workers_started = True
+    for i in range(DISTRIBUTED_LOCAL_WORKERS):
+        run_worker(LocalQueueClient(work_queue), worker_id=f"local-{i}")
+
+RESULT_SORTS = {'name', '-name', 'live', 'dead', 'subdomains'}
+RESULT_STATUSES = {'all', 'live', 'dead'}
+
+class ResultIndex:
+    # Name-sorted and subdomain-count-sorted keys for every result, split by live
+    # status, so the results API can filter, sort and page without re-sorting the
+    # whole inventory. Keys end in (name, seq)
+    def __init__(self):
+        self.reset()
+
+    def reset(self, domains=()):
+        self._seq = itertools.count()
+        self._keys = []
+        self._live_keys = []
+        self._dead_keys = []
+        self._size_keys = []
+        self._live_size_keys = []
+        self._dead_size_keys = []
+        self._results = {}
+        self._key_of = {}
+        for d in domains:
+            self.add(d)
+
+    def _key_lists(self, result, key):
+        size_key = (-result.subdomain_count,) + key
+        return [
+            (self._keys, key),
+            (self._live_keys if result.live else self._dead_keys, key),
+            (self._size_keys, size_key),
+            (self._live_size_keys if result.live else self._dead_size_keys, size_key)
+        ]
+
+    def add(self, result):
+        key = (result.domain.lower(), next(self._seq))
+        self._results[key[1]] = result
+        self._key_of[id(result)] = key
+        for keys, entry in self._key_lists(result, key):
+            bisect.insort(keys, entry)
+
+    def find(self, name):
+        name = name.lower()
+        i = bisect.bisect_left(self._keys, (name, -1))
+        found = []
+        while i < len(self._keys) and self._keys[i][0] == name:
+            found.append(self._results[self._keys[i][1]])
+            i += 1
+        return found
+
+    def remove(self, result):
+        key = self._key_of.pop(id(result), None)
+        if key is None:
+            return
+        del self._results[key[1]]
+        for keys, entry in self._key_lists(result, key):
+            del keys[bisect.bisect_left(keys, entry)]
+
+    def query(self, q='', status='all', sort='name', page=1, limit=50):
+        if sort == 'subdomains':
+            segments = [{'live': self._live_size_keys, 'dead': self._dead_size_keys}.get(status, self._size_keys)]
+        elif status == 'live':
+            segments = [self._live_keys]
+        elif status == 'dead':
+            segments = [self._dead_keys]
+        elif sort == 'live':
+            segments = [self._live_keys, self._dead_keys]
+        elif sort == 'dead':
+            segments = [self._dead_keys, self._live_keys]
+        else:
+            segments = [self._keys]
         
-        zones = client.list_hosted_zones()['HostedZones']
-        total = len(zones)
+        q = q.lower()
+        if q:
+            segments = [[key for key in segment if q in key[-2]] for segment in segments]
         
+        total = sum(len(segment) for segment in segments)
+        offset = (page - 1) * limit
+        window = []
+        for segment in segments:
+            if len(window) >= limit:
+                break
+            if offset >= len(segment):
+                offset -= len(segment)
+                continue
+            wanted = limit - len(window)
+            if sort == '-name':
+                end = len(segment) - offset
+                window.extend(reversed(segment[max(0, end - wanted):end]))
+            else:
+                window.extend(segment[offset:offset + wanted])
+            offset = 0
+        return total, [self._results[key[-1]] for key in window]
+
+result_index = ResultIndex()
+
+class ScanStats:
+    # Running live/dead totals, updated once per finished zone so the dashboard,
+    # charts and report never walk the subdomain lists again
+    def __init__(self, domains=()):
+        self.reset(domains)
+
+    def reset(self, domains=()):
+        self.zones = []
+        self.domains = 0
+        self.live_domains = 0
+        self.subdomains = 0
+        self.live_subdomains = 0
+        for d in domains:
+            self.add(d)
+
+    def add(self, result):
+        self.add_zone(result.domain, result.live, result.subdomain_count, result.live_subdomain_count)
+
+    def add_zone(self, domain, live, subdomains, live_subdomains):
+        self.zones.append((domain, bool(live), subdomains, live_subdomains))
+        self.domains += 1
+        self.live_domains += bool(live)
+        self.subdomains += subdomains
+        self.live_subdomains += live_subdomains
+
+    def copy(self):
+        stats = ScanStats()
+        stats.zones = list(self.zones)
+        stats.domains = self.domains
+        stats.live_domains = self.live_domains
+        stats.subdomains = self.subdomains
+        stats.live_subdomains = self.live_subdomains
+        return stats
+
+    def totals(self):
+        return {
+            'domains': self.domains,
+            'live_domains': self.live_domains,
+            'dead_domains': self.domains - self.live_domains,
+            'subdomains': self.subdomains,
+            'live_subdomains': self.live_subdomains,
+            'dead_subdomains': self.subdomains - self.live_subdomains,
+            'names': self.domains + self.subdomains,
+            'live_names': self.live_domains + self.live_subdomains
+        }
+
+    def zone_totals(self):
+        return [
+            {'domain': domain, 'live': live, 'subdomains': subdomains, 'live_subdomains': live_subdomains}
+            for domain, live, subdomains, live_subdomains in self.zones
+        ]
+
+scan_stats = ScanStats()
+
+def read_scan_stats():
+    if shared_store:
+        return shared_store.load_stats()
+    with scan_lock:
+        return scan_stats.copy()
+
+def record_partial(result):
+    with scan_lock:
+        result_index.add(result)
+        row = shared_store.add_partial(result) if shared_store else None
+    return result, row
+
+def discard_partial(partial):
+    with scan_lock:
+        result_index.remove(partial[0])
+        if shared_store and partial[1]:
+            shared_store.delete_result(partial[1])
+
+def record_result(result, partial=None):
+    with scan_lock:
+        scan_state['domains'].append(result)
+        if partial:
+            result_index.remove(partial[0])
+        result_index.add(result)
+        scan_stats.add(result)
+        scan_state['processed_zones'] += 1
+        scan_state['total_subdomains'] = scan_stats.subdomains
+        scan_state['probes_issued'] = probe_table.issued
+        scan_state['probes_coalesced'] = probe_table.coalesced
+        if shared_store:
+            shared_store.add_result(result, {
+                key: scan_state[key]
+                for key in ('processed_zones', 'total_subdomains', 'probes_issued', 'probes_coalesced')
+            }, replaces=partial[1] if partial else None)
+
+class ScanCheckpoint:
+    # Finished zones are appended to a results log as they complete; the small
+    # file at `path` only holds the scope and the pending zones, and is
+    # rewritten atomically every `interval` seconds
+    def __init__(self, scope, zones, completed=(), path=None, interval=None):
+        self.scope = scope
+        self.zones = zones
+        self.completed = set(completed)
+        self.path = path or CHECKPOINT_PATH
+        self.log_path = self.path + '.log'
+        self.interval = interval or CHECKPOINT_INTERVAL
+        self._last_saved = time.time()
+
+    def start(self):
+        open(self.log_path, 'w').close()
+        self.save()
+
+    def zone_done(self, zone, result):
+        self.completed.add(zone['Id'])
+        with open(self.log_path, 'a') as f:
+            f.write(json.dumps({'zone': zone, 'result': result.to_dict()}) + '\n')
+        if time.time() - self._last_saved >= self.interval:
+            self.save()
+
+    def save(self):
+        data = {
+            'scope': self.scope,
+            'pending': self.pending_zones(),
+            'saved_at': time.time()
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        self._last_saved = time.time()
+
+    def clear(self):
+        for path in (self.path, self.log_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or CHECKPOINT_PATH
+        with open(path) as f:
+            data = json.load(f)
+        zones = []
+        domains = []
+        completed = set()
+        if os.path.exists(path + '.log'):
+            with open(path + '.log') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash; that zone is scanned again
+                        continue
+                    if entry['zone']['Id'] in completed:
+                        continue
+                    completed.add(entry['zone']['Id'])
+                    zones.append(entry['zone'])
+                    domains.append(DomainResult.from_dict(entry['result']))
+        zones.extend(zone for zone in data['pending'] if zone['Id'] not in completed)
+        checkpoint = cls(data['scope'], zones, completed, path=path)
+        return checkpoint, domains
+
+    def pending_zones(self):
+        return [zone for zone in self.zones if zone['Id'] not in self.completed]
+
+class PriorityExecutor:
+    # Thread pool that runs the lowest priority value first, so work submitted
+    # later (record pages of a big zone) can still overtake smaller zones
+    def __init__(self, max_workers):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(max_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, priority, fn, *args):
+        future = Future()
+        with self._cond:
+            heapq.heappush(self._heap, (priority, next(self._seq), future, fn, args))
+            self._cond.notify()
+        return future
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                _, _, future, fn, args = heapq.heappop(self._heap)
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self, cancel_pending=False):
+        with self._cond:
+            if cancel_pending:
+                for _, _, future, _, _ in self._heap:
+                    future.cancel()
+            self._shutdown = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+class ZoneAssembly:
+    # Collects the probed pages of a split zone; whoever finishes last builds the result
+    def __init__(self, zone):
+        self.zone = zone
+        self.names = []
+        self.liveness = {}
+        self._pages = 0
+        self._listed = False
+        self._lock = threading.Lock()
+
+    def add_page(self):
+        with self._lock:
+            self._pages += 1
+
+    def page_done(self, names, liveness):
+        with self._lock:
+            self.names.extend(names)
+            self.liveness.update(liveness)
+            self._pages -= 1
+            return self._listed and self._pages == 0
+
+    def listing_done(self):
+        with self._lock:
+            self._listed = True
+            return self._pages == 0
+
+def scan_zones_local(zones, scope=None, checkpoint=None):
+    client = get_route53_client()
+    executor = PriorityExecutor(max_workers=SCAN_WORKERS)
+    events = queue.Queue()
+    
+    def guarded(fn):
+        def run(zone, *args):
+            try:
+                fn(zone, *args)
+            except ScanCancelled:
+                pass
+            except Exception as e:
+                events.put(('error', zone, e))
+        return run
+    
+    def apex_task(zone):
+        domain = zone['Name'].rstrip('.')
+        live = probe_names(zone, [domain], client)[domain]
+        events.put(('apex', zone, DomainResult(domain, live, pending=True, zone_id=zone['Id'])))
+    
+    def zone_task(zone):
+        events.put(('zone', zone, scan_single_domain(zone, scope, client, probe_apex=False)))
+    
+    def finish_assembly(assembly):
+        zone = assembly.zone
+        domain = zone['Name'].rstrip('.')
+        subdomains = [(name, assembly.liveness[name]) for name in assembly.names]
+        events.put(('zone', zone, DomainResult(domain, None, subdomains, zone_id=zone['Id'])))
+    
+    def page_task(zone, assembly, names):
+        liveness = probe_names(zone, names, client)
+        if assembly.page_done(names, liveness):
+            finish_assembly(assembly)
+    
+    def list_task(zone, priority):
+        assembly = ZoneAssembly(zone)
+        domain = zone['Name'].rstrip('.')
+        for records in iter_record_pages(zone, client):
+            if scan_cancel.is_set():
+                raise ScanCancelled()
+            assembly.add_page()
+            executor.submit(priority, guarded(page_task), zone, assembly, record_names(records, domain, scope))
+        if assembly.listing_done():
+            finish_assembly(assembly)
+    
+    # Apex checks go first so every zone shows up on the dashboard quickly; zone
+    # tasks skip the apex and take its result from here. Then zones run largest first
+    for zone in zones:
+        executor.submit((0, 0), guarded(apex_task), zone)
+    for zone in sorted(zones, key=zone_size, reverse=True):
+        priority = (1, -zone_size(zone))
+        if zone_size(zone) > ZONE_SPLIT_RECORDS:
+            executor.submit(priority, guarded(list_task), zone, priority)
+        else:
+            executor.submit(priority, guarded(zone_task), zone)
+    
+    remaining = {zone['Id'] for zone in zones}
+    partials = {}
+    apex_live = {}
+    held = {}
+    try:
+        while remaining and not scan_cancel.is_set():
+            try:
+                kind, zone, payload = events.get(timeout=1)
+            except queue.Empty:
+                continue
+            if zone['Id'] not in remaining:
+                continue
+            if kind == 'apex':
+                partials[zone['Id']] = record_partial(payload)
+                apex_live[zone['Id']] = payload.live
+                if zone['Id'] not in held:
+                    continue
+                kind, payload = 'zone', held.pop(zone['Id'])
+            elif kind == 'zone' and zone['Id'] not in apex_live:
+                # Finished before its apex probe; wait for that result
+                held[zone['Id']] = payload
+                continue
+            if kind == 'zone':
+                payload.live = apex_live[zone['Id']]
+            remaining.discard(zone['Id'])
+            partial = partials.pop(zone['Id'], None)
+            if kind == 'zone':
+                record_result(payload, partial)
+                if checkpoint:
+                    checkpoint.zone_done(zone, payload)
+            else:
+                if partial:
+                    discard_partial(partial)
+                print(f"Error scanning domain {zone['Name']}: {payload}")
+    finally:
+        # Queued work is dropped; running tasks stop at their next probe
+        executor.shutdown(cancel_pending=True)
+        for partial in partials.values():
+            discard_partial(partial)
+
+def scan_zones_distributed(zones, scope=None, checkpoint=None):
+    work_queue.reset()
+    work_queue.put(sorted(zones, key=zone_size, reverse=True), scope)
+    start_local_workers()
+    
+    remaining = {zone['Id']: zone for zone in zones}
+    while remaining and not scan_cancel.is_set():
+        try:
+            zone_id, result, error = work_queue.get_result(timeout=WORKER_POLL_INTERVAL)
+        except queue.Empty:
+            work_queue.requeue_expired()
+            continue
+        zone = remaining.pop(zone_id, None)
+        if zone is None:
+            continue
+        if error:
+            print(f"Error scanning domain {zone_id}: {error}")
+        else:
+            record_result(result)
+            if checkpoint:
+                checkpoint.zone_done(zone, result)
+    
+    if scan_cancel.is_set():
+        # Drops queued zones; late results from workers are rejected
+        work_queue.reset()
+
+def http_probe_ssl_context():
+    # Reachability only: a broken certificate still means something answered
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+async def http_probe_name(session, name):
+    for scheme in HTTP_PROBE_SCHEMES:
+        url = f"{scheme}://{name}/"
+        started = time.perf_counter()
+        try:
+            async with session.head(url, allow_redirects=False) as resp:
+                status = resp.status
+            if status in (405, 501):
+                async with session.get(url, allow_redirects=False) as resp:
+                    status = resp.status
+            return name, (status, round((time.perf_counter() - started) * 1000, 1))
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError):
+            continue
+    return name, (None, None)
+
+async def http_probe_names(names, cancel=None, on_result=None):
+    # One pooled session for the whole stage: keep-alive connections are reused
+    # per host, so repeat requests skip TCP and TLS handshakes
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_PROBE_CONCURRENCY,
+        limit_per_host=HTTP_PROBE_PER_HOST,
+        ssl=http_probe_ssl_context(),
+        ttl_dns_cache=300
+    )
+    # Only the socket connect and each read are timed; an overall `total` would
+    # also count time spent waiting for a free pooled connection
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=HTTP_PROBE_CONNECT_TIMEOUT,
+                                    sock_read=HTTP_PROBE_TIMEOUT)
+    results = {}
+    pending = iter(names)
+    
+    async def consume(session):
+        # A fixed set of consumers never has more requests in flight than the
+        # pool has connections, so no probe queues behind the pool
+        for name in pending:
+            if cancel and cancel.is_set():
+                return
+            name, result = await http_probe_name(session, name)
+            results[name] = result
+            if on_result:
+                on_result(name, result)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        running = {asyncio.ensure_future(consume(session)) for _ in range(HTTP_PROBE_CONCURRENCY)}
+        while running:
+            done, running = await asyncio.wait(running, timeout=0.5)
+            for task in done:
+                task.result()
+            if cancel and cancel.is_set():
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                break
+    return results
+
+def run_http_stage():
+    if not USE_AIOHTTP:
+        raise Exception("aiohttp not installed. Run: pip install aiohttp")
+    
+    with scan_lock:
+        domains = scan_state['domains'].copy()
+    names = []
+    for d in domains:
+        if d.live:
+            names.append(d.domain)
+        names.extend(name for name, live in d.iter_subdomains() if live)
+    names = list(dict.fromkeys(names))
+    
+    update_scan_state({'stage': 'http', 'http_total': len(names), 'http_checked': 0})
+    
+    def on_result(name, result):
         with scan_lock:
-            scan_state['total_zones'] = total
-        
-        with ThreadPoolExecutor(max_workers=100) as executor:
-            future_to_zone = {executor.submit(scan_single_domain, zone): zone for zone in zones}
+            scan_state['http_checked'] += 1
+            checked = scan_state['http_checked']
+        if shared_store and checked % 100 == 0:
+            shared_store.set_meta({'http_checked': checked})
+    
+    results = asyncio.run(http_probe_names(names, cancel=scan_cancel, on_result=on_result))
+    with scan_lock:
+        for d in domains:
+            d.http = {
+                name: results[name]
+                for name in [d.domain] + d.subdomain_names()
+                if name in results
+            }
+    if shared_store:
+        shared_store.replace_results(domains)
+        shared_store.set_meta({'http_checked': scan_state['http_checked']})
+
+def background_scan(scope=None, resume=False):
+    global scan_state
+    scan_cancel.clear()
+    probe_table.reset()
+    with scan_lock:
+        result_index.reset()
+        scan_stats.reset()
+    if shared_store:
+        shared_store.replace_results([])
+    update_scan_state({
+        'status': 'scanning',
+        'domains': [],
+        'total_zones': 0,
+        'processed_zones': 0,
+        'probes_issued': 0,
+        'probes_coalesced': 0,
+        'total_subdomains': 0,
+        'stage': 'dns',
+        'http_total': 0,
+        'http_checked': 0,
+        'scope': scope,
+        'error': None
+    })
+    
+    watcher_done = threading.Event()
+    if shared_store:
+        threading.Thread(target=watch_shared_scan, args=(watcher_done,), daemon=True).start()
+    
+    checkpoint = None
+    try:
+        if resume:
+            checkpoint, domains = ScanCheckpoint.load()
+            scope = checkpoint.scope
+            with scan_lock:
+                result_index.reset(domains)
+                scan_stats.reset(domains)
+            if shared_store:
+                shared_store.replace_results(domains)
+            update_scan_state({
+                'domains': domains,
+                'total_zones': len(checkpoint.zones),
+                'processed_zones': len(checkpoint.completed),
+                'total_subdomains': scan_stats.subdomains,
+                'scope': scope
+            })
+        else:
+            client = get_route53_client()
+            
+            zones = list_hosted_zones(client)
+            zones = [zone for zone in zones if zone_in_scope(zone, scope)]
+            checkpoint = ScanCheckpoint(scope, zones)
+            checkpoint.start()
             
-            for future in as_completed(future_to_zone):
-                try:
-                    result = future.result()
-                    with scan_lock:
-                        scan_state['domains'].append(result)
-                        scan_state['processed_zones'] += 1
-                except Exception as e:
-                    print(f"Error scanning domain: {e}")
+            update_scan_state({'total_zones': len(zones)})
+        
+        if SCAN_MODE == "distributed":
+            scan_zones_distributed(checkpoint.pending_zones(), scope, checkpoint)
+        else:
+            scan_zones_local(checkpoint.pending_zones(), scope, checkpoint)
         
+        if scope and scope.get('http_probe') and not scan_cancel.is_set():
+            run_http_stage()
+        
+        if scan_cancel.is_set():
+            checkpoint.save()
+            update_scan_state({'status': 'cancelled'})
+            return
+        
+        failed_zones = checkpoint.pending_zones()
+        checkpoint.clear()
         with scan_lock:
-            scan_state['status'] = 'completed'
+            domains = scan_state['domains'].copy()
+        try:
+            save_snapshot(domains, scope, failed_zones)
+        except Exception as e:
+            print(f"Snapshot error: {e}")
+        update_scan_state({'status': 'completed'})
+        
+        if monitor.running:
+            completed = set(checkpoint.completed)
+            if scope and scope['record_types']:
+                # Only some record types were listed, so absent names may still exist
+                replace = set()
+            elif scope and (scope['zone_ids'] or scope['zone_patterns'] or scope['zone_type'] != 'all'):
+                replace = completed
+            else:
+                # A full listing also retires zones that were deleted altogether
+                listed = {zone['Id'] for zone in checkpoint.zones}
+                replace = completed | (monitor.zone_ids() - listed)
+            monitor.track_results(domains, checkpoint.zones, replace)
             
     except Exception as e:
-        with scan_lock:
-            scan_state['status'] = 'error'
-            scan_state['error'] = str(e)
+        if checkpoint:
+            checkpoint.save()
+        update_scan_state({'status': 'error', 'error': str(e)})
+    finally:
+        watcher_done.set()
 
-def generate_overall_status_chart(domains):
-    if not domains:
-        return ""
-        
-    all_items = []
-    for d in domains:
-        all_items.append(d['live'])
+def snapshot_entries(domains):
+    entries = {}
     for d in domains:
-        for sub in d['subdomains']:
-            all_items.append(sub['live'])
+        entries[d.domain.lower()] = entries.get(d.domain.lower(), False) or d.live
+        for name, live in d.iter_subdomains():
+            entries[name.lower()] = entries.get(name.lower(), False) or live
+    return sorted(entries.items())
+
+def snapshot_path(snapshot_id):
+    return os.path.join(SNAPSHOT_DIR, f"{snapshot_id}.tsv.gz")
+
+def save_snapshot(domains, scope=None, failed_zones=()):
+    # Header line with JSON metadata, then one "name<TAB>0|1" line per name in
+    # sorted order, so two snapshots can be diffed by streaming them side by side
+    entries = snapshot_entries(domains)
+    body = ''.join(f"{name}\t{int(live)}\n" for name, live in entries)
+    digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+    meta = {
+        'id': f"{time.strftime('%Y%m%d-%H%M%S')}-{digest[:12]}",
+        'created': time.time(),
+        'hash': digest,
+        'names': len(entries),
+        'live': sum(1 for _, live in entries if live),
+        'scope': scope,
+        # Zones whose scan errored; their names are missing, not deleted
+        'failed_zones': [{'id': zone['Id'], 'name': zone['Name'].rstrip('.').lower()} for zone in failed_zones]
+    }
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_path = snapshot_path(meta['id']) + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        f.write(json.dumps(meta) + '\n')
+        f.write(body)
+    os.replace(tmp_path, snapshot_path(meta['id']))
+    return meta
+
+def read_snapshot_meta(snapshot_id):
+    with gzip.open(snapshot_path(snapshot_id), 'rt', encoding='utf-8') as f:
+        return json.loads(f.readline())
+
+def iter_snapshot(snapshot_id):
+    with gzip.open(snapshot_path(snapshot_id), 'rt', encoding='utf-8') as f:
+        f.readline()
+        for line in f:
+            name, live = line.rstrip('\n').split('\t')
+            yield name, live == '1'
+
+def list_snapshots():
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+    ids = sorted(
+        name[:-len('.tsv.gz')] for name in os.listdir(SNAPSHOT_DIR)
+        if name.endswith('.tsv.gz') and SNAPSHOT_ID_PATTERN.match(name[:-len('.tsv.gz')])
+    )
+    return [read_snapshot_meta(snapshot_id) for snapshot_id in ids]
+
+def snapshot_exists(snapshot_id):
+    return bool(snapshot_id and SNAPSHOT_ID_PATTERN.match(snapshot_id)) and os.path.exists(snapshot_path(snapshot_id))
+
+def snapshot_scope_key(scope):
+    # Snapshots are comparable when they cover the same zones and record types,
+    # however the lists were ordered when the scan was started
+    scope = {
+        key: sorted(set(value)) if isinstance(value, list) else value
+        for key, value in (scope or parse_scan_scope({})).items() if key != 'http_probe'
+    }
+    return json.dumps(scope, sort_keys=True)
+
+def in_failed_zone(name, failed):
+    labels = name.split('.')
+    return any('.'.join(labels[i:]) in failed for i in range(len(labels)))
+
+def diff_snapshots(old_id, new_id):
+    old_meta = read_snapshot_meta(old_id)
+    new_meta = read_snapshot_meta(new_id)
+    failed = {zone['name'] for meta in (old_meta, new_meta) for zone in meta.get('failed_zones', [])}
+    diff = {
+        'from': old_meta,
+        'to': new_meta,
+        'added': [],
+        'removed': [],
+        'went_live': [],
+        'went_dead': [],
+        'skipped_zones': sorted(failed)
+    }
+    if old_meta['hash'] == new_meta['hash']:
+        return diff
     
-    live_count = sum(all_items)
-    non_live_count = len(all_items) - live_count
+    # Both snapshots are sorted by name, so a single linear merge finds every change
+    sentinel = (None, None)
+    old_iter = iter_snapshot(old_id)
+    new_iter = iter_snapshot(new_id)
+    old_name, old_live = next(old_iter, sentinel)
+    new_name, new_live = next(new_iter, sentinel)
+    while old_name is not None or new_name is not None:
+        if new_name is None or (old_name is not None and old_name < new_name):
+            if not (failed and in_failed_zone(old_name, failed)):
+                diff['removed'].append({'name': old_name, 'live': old_live})
+            old_name, old_live = next(old_iter, sentinel)
+        elif old_name is None or new_name < old_name:
+            if not (failed and in_failed_zone(new_name, failed)):
+                diff['added'].append({'name': new_name, 'live': new_live})
+            new_name, new_live = next(new_iter, sentinel)
+        else:
+            if old_live != new_live:
+                diff['went_live' if new_live else 'went_dead'].append(new_name)
+            old_name, old_live = next(old_iter, sentinel)
+            new_name, new_live = next(new_iter, sentinel)
+    return diff
+
+class LivenessMonitor:
+    def __init__(self, probe=None, workers=MONITOR_WORKERS):
+        self.probe = probe or self._probe_name
+        self.workers = workers
+        self._client = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._heap = []
+        self._records = {}
+        self._seq = itertools.count()
+        self._events = deque(maxlen=MONITOR_EVENT_LIMIT)
+        self._event_id = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _track_locked(self, key, live, zone):
+        record = self._records.get(key)
+        if record:
+            # A newer scan is the latest word on the record; the schedule is kept
+            record.update(live=live, zone=zone)
+            return
+        interval = MONITOR_MIN_INTERVAL
+        # Spread the first round over one interval so seeding a large
+        # inventory turns into a steady trickle rather than a burst
+        next_due = time.time() + random.uniform(0, interval)
+        self._records[key] = {
+            'live': live,
+            'zone': zone,
+            'interval': interval,
+            'next_due': next_due,
+            'last_change': None
+        }
+        heapq.heappush(self._heap, (next_due, next(self._seq), key))
+
+    def track_results(self, domains, zones, replace=None):
+        # Records are keyed by (zone Id, name) so split-horizon public and private
+        # zones stay apart. Tracked names of the zones in `replace` (every zone
+        # when None) that are missing from `domains` were deleted and are dropped
+        zone_by_id = {zone['Id']: zone for zone in zones}
+        zone_by_name = {}
+        for zone in zones:
+            zone_by_name.setdefault(zone['Name'].rstrip('.'), zone)
+        names = {}
+        for d in domains:
+            # Results saved before zone Ids were recorded fall back to the name
+            zone = zone_by_id.get(d.zone_id) if d.zone_id else zone_by_name.get(d.domain)
+            if not zone:
+                continue
+            names[(zone['Id'], d.domain)] = (d.live, zone)
+            for name, live in d.iter_subdomains():
+                names.setdefault((zone['Id'], name), (live, zone))
+        with self._lock:
+            for key, record in list(self._records.items()):
+                if key not in names and (replace is None or record['zone']['Id'] in replace):
+                    del self._records[key]
+            for key, (live, zone) in names.items():
+                self._track_locked(key, live, zone)
+            self._wakeup.notify()
+
+    def zone_ids(self):
+        with self._lock:
+            return {record['zone']['Id'] for record in self._records.values()}
+
+    def start(self):
+        if self.running:
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            self._wakeup.notify_all()
+
+    def events_since(self, event_id=0):
+        with self._lock:
+            return [e for e in self._events if e['id'] > event_id]
+
+    def status(self):
+        with self._lock:
+            return {
+                'running': self.running,
+                'tracked': len(self._records),
+                'next_due': self._heap[0][0] if self._heap else None,
+                'last_event_id': self._event_id
+            }
+
+    def _pop_due(self):
+        while self._heap:
+            next_due, _, key = self._heap[0]
+            record = self._records.get(key)
+            if record is None or record['next_due'] != next_due:
+                heapq.heappop(self._heap)
+                continue
+            if next_due > time.time():
+                return None, next_due - time.time()
+            heapq.heappop(self._heap)
+            return key, 0
+        return None, None
+
+    def _run(self):
+        slots = threading.Semaphore(self.workers)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stop.is_set():
+                with self._lock:
+                    key, wait = self._pop_due()
+                    if key is None:
+                        self._wakeup.wait(1 if wait is None else min(wait, 1))
+                        continue
+                slots.acquire()
+                executor.submit(self._probe_and_reschedule, key, slots)
+
+    def _probe_name(self, name, zone):
+        if self._client is None:
+            self._client = get_route53_client()
+        return probe_names(zone, [name], self._client, cancel=self._stop, shared=False)[name]
+
+    def _probe_and_reschedule(self, key, slots):
+        name = key[1]
+        with self._lock:
+            record = self._records.get(key)
+        if record is None:
+            slots.release()
+            return
+        try:
+            live = self.probe(name, record['zone'])
+        except ScanCancelled:
+            # Stopped mid-probe; keep the name due so a restart picks it up
+            with self._lock:
+                if key in self._records:
+                    heapq.heappush(self._heap, (record['next_due'], next(self._seq), key))
+            return
+        except Exception as e:
+            # No answer is not a state change; try again at the current interval
+            print(f"Monitor probe error for {name}: {e}")
+            live = None
+        finally:
+            slots.release()
+        
+        now = time.time()
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                return
+            if live is None:
+                pass
+            elif live != record['live']:
+                self._event_id += 1
+                self._events.append({
+                    'id': self._event_id,
+                    'name': name,
+                    'zone_id': key[0],
+                    'live': live,
+                    'previous': record['live'],
+                    'time': now
+                })
+                print(f"🔔 {name} is now {'LIVE' if live else 'NON-LIVE'}")
+                record.update(live=live, interval=MONITOR_MIN_INTERVAL, last_change=now)
+            else:
+                record['interval'] = min(record['interval'] * MONITOR_BACKOFF, MONITOR_MAX_INTERVAL)
+            record['next_due'] = now + record['interval']
+            heapq.heappush(self._heap, (record['next_due'], next(self._seq), key))
+            self._wakeup.notify()
+
+monitor = LivenessMonitor()
+
+def generate_overall_status_chart(stats):
+    if not stats.domains:
+        return ""
+        
+    totals = stats.totals()
     
     plt.figure(figsize=(8, 6))
-    plt.pie([live_count, non_live_count], 
+    plt.pie([totals['live_names'], totals['names'] - totals['live_names']], 
             labels=['Live', 'Non-Live'], 
             colors=['#28a745', '#dc3545'],
             autopct='%1.1f%%',
@@ -161,17 +2136,14 @@ def generate_overall_status_chart(domains):
     plt.close()
     return base64.b64encode(img.getvalue()).decode('utf-8')
 
-def generate_domain_breakdown_chart(domains):
-    if not domains:
+def generate_domain_breakdown_chart(stats):
+    if not stats.domains:
         return ""
     
-    domain_lives = sum(1 for d in domains if d['live'])
-    domain_deads = sum(1 for d in domains if not d['live'])
-    sub_lives = sum(1 for d in domains for s in d['subdomains'] if s['live'])
-    sub_deads = sum(1 for d in domains for s in d['subdomains'] if not s['live'])
+    totals = stats.totals()
     
     labels = ['Live Domains', 'Non-Live Domains', 'Live Subdomains', 'Non-Live Subdomains']
-    sizes = [domain_lives, domain_deads, sub_lives, sub_deads]
+    sizes = [totals['live_domains'], totals['dead_domains'], totals['live_subdomains'], totals['dead_subdomains']]
     colors = ['#28a745', '#dc3545', '#20c997', '#fd7e14']
     
     plt.figure(figsize=(10, 6))
@@ -193,17 +2165,13 @@ def generate_domain_breakdown_chart(domains):
     plt.close()
     return base64.b64encode(img.getvalue()).decode('utf-8')
 
-def generate_domain_subdomain_charts(domains):
+def generate_domain_subdomain_charts(stats):
     charts = []
-    for domain in domains:
-        if not domain['subdomains']:
+    for domain, _, total_subs, live_subs in stats.zones:
+        if not total_subs:
             continue
             
-        live_subs = sum(1 for s in domain['subdomains'] if s['live'])
-        dead_subs = len(domain['subdomains']) - live_subs
-        
-        if live_subs + dead_subs == 0:
-            continue
+        dead_subs = total_subs - live_subs
             
         plt.figure(figsize=(6, 4))
         plt.pie([live_subs, dead_subs], 
@@ -218,36 +2186,37 @@ def generate_domain_subdomain_charts(domains):
         img.seek(0)
         plt.close()
         charts.append({
-            'domain': domain['domain'],
+            'domain': domain,
+            'live': live_subs,
+            'total': total_subs,
             'chart': base64.b64encode(img.getvalue()).decode('utf-8')
         })
     
     return charts
 
-def generate_pdf_report(domains):
+def generate_pdf_report(domains, stats=None):
     if not USE_WEASYPRINT:
         raise Exception("WeasyPrint not installed. Run: pip install weasyprint")
     
-    overall_chart = generate_overall_status_chart(domains)
-    breakdown_chart = generate_domain_breakdown_chart(domains)
-    domain_charts = generate_domain_subdomain_charts(domains)
+    stats = stats or ScanStats(domains)
+    overall_chart = generate_overall_status_chart(stats)
+    breakdown_chart = generate_domain_breakdown_chart(stats)
+    domain_charts = generate_domain_subdomain_charts(stats)
     
-    total_domains = len(domains)
-    total_subdomains = sum(len(d['subdomains']) for d in domains)
-    live_domains = sum(1 for d in domains if d['live'])
-    live_subdomains = sum(1 for d in domains for s in d['subdomains'] if s['live'])
+    total_domains = stats.domains
+    total_subdomains = stats.subdomains
+    live_domains = stats.live_domains
+    live_subdomains = stats.live_subdomains
     
     table_rows = ""
     for domain in domains:
-        domain_status = "Live" if domain['live'] else "Non-Live"
-        domain_class = "live" if domain['live'] else "dead"
-        live_subs = sum(1 for s in domain['subdomains'] if s['live'])
-        total_subs = len(domain['subdomains'])
+        domain_status = "Live" if domain.live else "Non-Live"
+        domain_class = "live" if domain.live else "dead"
         
-        if total_subs == 0:
+        if not domain.subdomain_count:
             subdomain_html = "<span class='text-muted'>None</span>"
         else:
-            sub_names = [sub['name'] for sub in domain['subdomains']]
+            sub_names = domain.subdomain_names()
             formatted_subs = []
             for i in range(0, len(sub_names), 4):
                 chunk = sub_names[i:i+4]
@@ -256,7 +2225,7 @@ def generate_pdf_report(domains):
         
         table_rows += f"""
         <tr>
-            <td class="domain-col">{domain['domain']}</td>
+            <td class="domain-col">{domain.domain}</td>
             <td class="status-col"><span class="{domain_class}">{domain_status}</span></td>
             <td class="subdomains-col">{subdomain_html}</td>
         </tr>
@@ -265,14 +2234,7 @@ def generate_pdf_report(domains):
     domain_charts_html = ""
     if domain_charts:
         for chart_data in domain_charts:
-            domain_name = chart_data['domain']
-            target_domain = next((d for d in domains if d['domain'] == domain_name), None)
-            if target_domain:
-                live_count = sum(1 for s in target_domain['subdomains'] if s['live'])
-                total_count = len(target_domain['subdomains'])
-                chart_title = f"{domain_name} ({live_count}/{total_count} Live)"
-            else:
-                chart_title = domain_name
+            chart_title = f"{chart_data['domain']} ({chart_data['live']}/{chart_data['total']} Live)"
                 
             domain_charts_html += f"""
             <div class="domain-chart-item">
@@ -539,18 +2501,58 @@ def generate_pdf_report(domains):
     </html>
     """
     
-    pdf_path = "/tmp/route53_report.pdf"
-    HTML(string=html_content).write_pdf(pdf_path)
-    return pdf_path
+    # Rendered in memory so concurrent requests and worker processes never share a file
+    return HTML(string=html_content).write_pdf()
+
+def generate_diff_pdf(diff):
+    if not USE_WEASYPRINT:
+        raise Exception("WeasyPrint not installed. Run: pip install weasyprint")
+    
+    def section(title, names, css_class):
+        if not names:
+            return f"<h2>{title} (0)</h2><p class='text-muted'>None</p>"
+        rows = "".join(f"<li class='{css_class}'>{name}</li>" for name in names)
+        return f"<h2>{title} ({len(names)})</h2><ul>{rows}</ul>"
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <style>
+            @page {{ size: A4; margin: 15mm 10mm; }}
+            body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; color: #333; font-size: 9pt; }}
+            h1 {{ font-size: 16pt; color: #2575fc; margin-bottom: 2mm; }}
+            h2 {{ font-size: 11pt; color: #495057; margin: 8mm 0 3mm; border-bottom: 1px solid #e9ecef; }}
+            ul {{ columns: 2; margin: 0; padding-left: 5mm; }}
+            .live {{ color: #28a745; }}
+            .dead {{ color: #dc3545; }}
+            .text-muted {{ color: #6c757d; font-style: italic; }}
+        </style>
+    </head>
+    <body>
+        <h1>Route53 Scan Changes</h1>
+        <p>From scan {diff['from']['id']} ({diff['from']['names']} names) to scan {diff['to']['id']} ({diff['to']['names']} names)</p>
+        {section("Went Non-Live", diff['went_dead'], "dead")}
+        {section("Went Live", diff['went_live'], "live")}
+        {section("New Records", [e['name'] for e in diff['added']], "")}
+        {section("Deleted Records", [e['name'] for e in diff['removed']], "")}
+        {f"<p class='text-muted'>Not compared (scan errors): {', '.join(diff['skipped_zones'])}</p>" if diff['skipped_zones'] else ""}
+        <p class="text-muted">Report generated on {time.strftime("%Y-%m-%d %H:%M:%S")}</p>
+    </body>
+    </html>
+    """
+    return HTML(string=html_content).write_pdf()
 
-def send_email_with_pdf(recipient_email, pdf_path):
+def send_email_with_pdf(recipient_email, pdf_data, subject=None, body=None,
+                        filename='route53_security_report_advanced.pdf'):
     try:
         msg = MIMEMultipart()
         msg['From'] = EMAIL_USERNAME
         msg['To'] = recipient_email
-        msg['Subject'] = "Route53 Live Domain Report - Advanced Analytics"
+        msg['Subject'] = subject or "Route53 Live Domain Report - Advanced Analytics"
         
-        body = """
+        body = body or """
         Hello,
         
         Attached is your comprehensive Route53 Live Domain Report featuring:
@@ -567,14 +2569,13 @@ def send_email_with_pdf(recipient_email, pdf_path):
         """
         msg.attach(MIMEText(body, 'plain'))
         
-        with open(pdf_path, "rb") as attachment:
-            part = MIMEBase('application', 'octet-stream')
-            part.set_payload(attachment.read())
+        part = MIMEBase('application', 'octet-stream')
+        part.set_payload(pdf_data)
         
         encoders.encode_base64(part)
         part.add_header(
             'Content-Disposition',
-            f'attachment; filename=route53_security_report_advanced.pdf'
+            f'attachment; filename={filename}'
         )
         msg.attach(part)
         
@@ -609,6 +2610,12 @@ def index():
             .speed-badge { background: linear-gradient(45deg, #0d6efd, #6f42c1); color: white; }
             .pdf-btn { background: linear-gradient(45deg, #d63384, #dc3545); border: none; }
             .email-btn { background: linear-gradient(45deg, #0dcaf0, #0d6efd); border: none; }
+            #resultsViewport { height: 600px; overflow-y: auto; position: relative; background: white; border: 1px solid #dee2e6; border-radius: .375rem; }
+            #resultsSpacer { position: relative; }
+            #resultsRows { position: absolute; top: 0; left: 0; right: 0; }
+            .result-row { height: 72px; padding: .5rem 1rem; border-bottom: 1px solid #f1f3f5; cursor: pointer; overflow: hidden; }
+            .result-row:hover { background: #f8f9fa; }
+            .result-row .subs { white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
         </style>
     </head>
     <body>
@@ -620,6 +2627,8 @@ def index():
             
             <div class="d-flex gap-2 mb-4 flex-wrap">
                 <button id="startBtn" class="btn btn-primary">Start Scan</button>
+                <button id="cancelBtn" class="btn btn-outline-danger" disabled>Cancel Scan</button>
+                <button id="resumeBtn" class="btn btn-outline-primary hidden">Resume Scan</button>
                 <button id="resetBtn" class="btn btn-outline-secondary">Reset</button>
                 <button id="pdfBtn" class="btn pdf-btn" disabled>
                     <i class="fas fa-file-pdf"></i> Generate PDF
@@ -651,6 +2660,28 @@ def index():
                 </div>
             </div>
             
+            <div class="row g-2 mb-4">
+                <div class="col-md-5">
+                    <input type="text" class="form-control" id="zoneFilterInput" placeholder="Zone IDs or patterns, e.g. *.example.com (optional)">
+                </div>
+                <div class="col-md-3">
+                    <select class="form-select" id="zoneTypeSelect">
+                        <option value="all">All zones</option>
+                        <option value="public">Public zones only</option>
+                        <option value="private">Private zones only</option>
+                    </select>
+                </div>
+                <div class="col-md-2">
+                    <input type="text" class="form-control" id="recordTypesInput" placeholder="Record types, e.g. A,CNAME">
+                </div>
+                <div class="col-md-2 d-flex align-items-center">
+                    <div class="form-check">
+                        <input class="form-check-input" type="checkbox" id="httpProbeInput">
+                        <label class="form-check-label" for="httpProbeInput">HTTP check</label>
+                    </div>
+                </div>
+            </div>
+            
             <div id="progressSection" class="hidden">
                 <div class="card">
                     <div class="card-body">
@@ -664,7 +2695,45 @@ def index():
                 </div>
             </div>
             
-            <div id="results"></div>
+            <div id="results" class="hidden">
+                <div class="row g-2 mb-2">
+                    <div class="col-md-6">
+                        <input type="search" class="form-control" id="resultsSearch" placeholder="Search domains">
+                    </div>
+                    <div class="col-md-3">
+                        <select class="form-select" id="resultsStatus">
+                            <option value="all">All statuses</option>
+                            <option value="live">Live only</option>
+                            <option value="dead">Non-Live only</option>
+                        </select>
+                    </div>
+                    <div class="col-md-3">
+                        <select class="form-select" id="resultsSort">
+                            <option value="name">Name A-Z</option>
+                            <option value="-name">Name Z-A</option>
+                            <option value="live">Live first</option>
+                            <option value="dead">Non-Live first</option>
+                            <option value="subdomains">Most subdomains</option>
+                        </select>
+                    </div>
+                </div>
+                <p id="resultsCount" class="text-muted small mb-2"></p>
+                <div id="resultsViewport">
+                    <div id="resultsSpacer"><div id="resultsRows"></div></div>
+                </div>
+            </div>
+            
+            <div class="modal fade" id="domainModal" tabindex="-1">
+                <div class="modal-dialog modal-lg modal-dialog-scrollable">
+                    <div class="modal-content">
+                        <div class="modal-header">
+                            <h5 class="modal-title">Domain Details</h5>
+                            <button type="button" class="btn-close" data-bs-dismiss="modal"></button>
+                        </div>
+                        <div class="modal-body" id="domainModalBody"></div>
+                    </div>
+                </div>
+            </div>
             <div id="error" class="alert alert-danger hidden"></div>
             <div id="completed" class="alert alert-success hidden">
                 <h5>✅ Scan Completed!</h5>
@@ -682,21 +2751,54 @@ def index():
         let scanInterval = null;
         let isScanning = false;
         
-        async function startScan() {
+        const ROW_HEIGHT = 72;
+        const PAGE_SIZE = 100;
+        let pageCache = new Map();
+        let resultsTotal = 0;
+        let renderToken = 0;
+        let renderQueued = false;
+        let lastProcessed = -1;
+        
+        async function startScan(resume = false) {
             if (isScanning) return;
             
-            document.getElementById('results').innerHTML = '';
+            clearResults();
+            document.getElementById('results').classList.remove('hidden');
             document.getElementById('error').classList.add('hidden');
             document.getElementById('completed').classList.add('hidden');
             document.getElementById('emailSuccess').classList.add('hidden');
             document.getElementById('progressSection').classList.remove('hidden');
             document.getElementById('startBtn').disabled = true;
+            document.getElementById('cancelBtn').disabled = false;
+            document.getElementById('resumeBtn').classList.add('hidden');
             document.getElementById('pdfBtn').disabled = true;
             document.getElementById('emailBtn').disabled = true;
             isScanning = true;
             
+            const zoneFilters = document.getElementById('zoneFilterInput').value
+                .split(',').map(s => s.trim()).filter(Boolean);
+            const zoneIdPattern = new RegExp('^(/hostedzone/)?Z[A-Z0-9]+$');
+            const scope = {
+                zone_ids: zoneFilters.filter(z => zoneIdPattern.test(z)),
+                zone_patterns: zoneFilters.filter(z => !zoneIdPattern.test(z)),
+                zone_type: document.getElementById('zoneTypeSelect').value,
+                record_types: document.getElementById('recordTypesInput').value,
+                http_probe: document.getElementById('httpProbeInput').checked,
+                resume: resume
+            };
+            
             try {
-                await fetch('/api/start-scan', { method: 'POST' });
+                const response = await fetch('/api/start-scan', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: JSON.stringify(scope)
+                });
+                if (!response.ok) {
+                    const result = await response.json();
+                    showError(result.error || 'Failed to start scan');
+                    isScanning = false;
+                    return;
+                }
                 scanInterval = setInterval(fetchResults, 300);
             } catch (err) {
                 showError('Failed to start scan: ' + err.message);
@@ -705,19 +2807,28 @@ def index():
         
         async function fetchResults() {
             try {
-                const response = await fetch('/api/scan-status');
+                const response = await fetch('/api/scan-status?domains=0');
                 const data = await response.json();
                 
                 updateProgress(data);
-                showNewDomains(data.domains);
+                if (data.processed_zones !== lastProcessed || data.status !== 'scanning') {
+                    lastProcessed = data.processed_zones;
+                    refreshResults();
+                }
                 
-                if (data.status === 'completed' || data.status === 'error') {
+                if (['completed', 'error', 'cancelled', 'interrupted'].includes(data.status)) {
                     clearInterval(scanInterval);
                     isScanning = false;
                     document.getElementById('startBtn').disabled = false;
+                    document.getElementById('cancelBtn').disabled = true;
+                    document.getElementById('resumeBtn').classList.toggle('hidden', !data.resumable);
                     
                     if (data.status === 'error') {
                         showError(data.error);
+                    } else if (data.status === 'cancelled') {
+                        showError(`Scan cancelled after ${data.processed_zones}/${data.total_zones} domains. Use Resume Scan to continue.`);
+                    } else if (data.status === 'interrupted') {
+                        showError(`Scan interrupted after ${data.processed_zones}/${data.total_zones} domains: the scanning process stopped responding. Use Resume Scan to continue.`);
                     } else {
                         showCompletion(data);
                         document.getElementById('pdfBtn').disabled = false;
@@ -733,30 +2844,149 @@ def index():
             const progress = document.getElementById('progressBar');
             const progressText = document.getElementById('progressText');
             
-            if (data.total_zones > 0) {
+            if (data.stage === 'http' && data.http_total > 0) {
+                const percent = Math.min(100, Math.floor((data.http_checked / data.http_total) * 100));
+                progress.style.width = percent + '%';
+                progressText.textContent = `HTTP reachability: checked ${data.http_checked}/${data.http_total} live names`;
+            } else if (data.total_zones > 0) {
                 const percent = Math.min(100, Math.floor((data.processed_zones / data.total_zones) * 100));
                 progress.style.width = percent + '%';
                 progressText.textContent = `Completed ${data.processed_zones}/${data.total_zones} domains`;
             }
         }
         
-        function showNewDomains(newDomains) {
-            const resultsDiv = document.getElementById('results');
-            const existingDomains = new Set();
-            resultsDiv.querySelectorAll('.domain-card').forEach(card => {
-                existingDomains.add(card.dataset.domain);
-            });
-            
-            const sortedNew = [...newDomains].sort((a, b) => a.domain.localeCompare(b.domain));
+        function escapeHtml(text) {
+            const div = document.createElement('div');
+            div.textContent = text;
+            return div.innerHTML;
+        }
+        
+        function resultsQuery() {
+            return {
+                q: document.getElementById('resultsSearch').value.trim(),
+                status: document.getElementById('resultsStatus').value,
+                sort: document.getElementById('resultsSort').value
+            };
+        }
+        
+        async function fetchPage(page) {
+            const params = new URLSearchParams({...resultsQuery(), page: page, limit: PAGE_SIZE});
+            const key = params.toString();
+            if (!pageCache.has(key)) {
+                pageCache.set(key, fetch('/api/results?' + params)
+                    .then(response => response.json())
+                    .then(data => {
+                        resultsTotal = data.total;
+                        return data.items;
+                    })
+                    .catch(err => {
+                        pageCache.delete(key);
+                        throw err;
+                    }));
+            }
+            return pageCache.get(key);
+        }
+        
+        // Only the rows inside the viewport exist in the DOM; pages of results
+        // are fetched from the server as the window scrolls over them
+        async function renderWindow() {
+            const token = ++renderToken;
+            const viewport = document.getElementById('resultsViewport');
+            const first = Math.floor(viewport.scrollTop / ROW_HEIGHT);
+            const count = Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 1;
+            const firstPage = Math.floor(first / PAGE_SIZE) + 1;
+            const lastPage = Math.floor((first + count) / PAGE_SIZE) + 1;
             
-            sortedNew.forEach(domain => {
-                if (!existingDomains.has(domain.domain)) {
-                    const card = createDomainCard(domain);
-                    resultsDiv.appendChild(card);
+            const pages = [];
+            try {
+                for (let page = firstPage; page <= lastPage; page++) {
+                    pages.push(await fetchPage(page));
                 }
+            } catch (err) {
+                console.error('Results error:', err);
+                return;
+            }
+            if (token !== renderToken) return;
+            
+            const items = [].concat(...pages);
+            const start = first - (firstPage - 1) * PAGE_SIZE;
+            let html = '';
+            for (let i = start; i < Math.min(items.length, start + count); i++) {
+                html += createResultRow(items[i], first + i - start);
+            }
+            
+            document.getElementById('resultsSpacer').style.height = (resultsTotal * ROW_HEIGHT) + 'px';
+            const rows = document.getElementById('resultsRows');
+            rows.style.transform = `translateY(${first * ROW_HEIGHT}px)`;
+            rows.innerHTML = html;
+            document.getElementById('resultsCount').textContent = `${resultsTotal} matching domains`;
+        }
+        
+        function scheduleRender() {
+            if (renderQueued) return;
+            renderQueued = true;
+            requestAnimationFrame(() => {
+                renderQueued = false;
+                renderWindow();
             });
         }
         
+        function refreshResults() {
+            pageCache = new Map();
+            scheduleRender();
+        }
+        
+        function clearResults() {
+            pageCache = new Map();
+            resultsTotal = 0;
+            lastProcessed = -1;
+            renderToken++;
+            document.getElementById('resultsRows').innerHTML = '';
+            document.getElementById('resultsSpacer').style.height = '0px';
+            document.getElementById('resultsCount').textContent = '';
+            document.getElementById('resultsViewport').scrollTop = 0;
+        }
+        
+        function createResultRow(domain, index) {
+            const status = domain.live ? 
+                '<span class="live">● Live</span>' : 
+                '<span class="dead">● Non-Live</span>';
+            const preview = domain.preview.map(escapeHtml).join(', ') +
+                (domain.subdomain_count > domain.preview.length ? ', …' : '');
+            const counts = domain.pending ?
+                '<span class="badge bg-secondary ms-2">Scanning records…</span>' :
+                `<span class="text-muted small ms-2">${domain.live_subdomains}/${domain.subdomain_count} live subdomains</span>`;
+            return `
+                <div class="result-row" data-index="${index}">
+                    <div class="d-flex justify-content-between">
+                        <strong>${escapeHtml(domain.domain)}</strong>
+                        <span>${status} ${counts}</span>
+                    </div>
+                    <div class="subs text-muted small">${preview || (domain.pending ? '' : 'No subdomains')}</div>
+                </div>
+            `;
+        }
+        
+        async function showDomainDetails(index) {
+            const page = Math.floor(index / PAGE_SIZE) + 1;
+            const items = await fetchPage(page);
+            const row = items[index - (page - 1) * PAGE_SIZE];
+            if (!row) return;
+            // List rows only carry counts; the full subdomain list is fetched on open
+            let details = [];
+            try {
+                const response = await fetch('/api/results/' + encodeURIComponent(row.domain));
+                details = (await response.json()).items || [];
+            } catch (err) {
+                console.error('Details error:', err);
+            }
+            const body = document.getElementById('domainModalBody');
+            body.innerHTML = '';
+            details.forEach(domain => body.appendChild(createDomainCard(domain)));
+            if (!details.length) body.textContent = 'Could not load details for ' + row.domain;
+            bootstrap.Modal.getOrCreateInstance(document.getElementById('domainModal')).show();
+        }
+        
         function createDomainCard(domain) {
             const card = document.createElement('div');
             card.className = 'card domain-card';
@@ -774,14 +3004,16 @@ def index():
                     const subStatus = sub.live ? 
                         '<span class="live">Live</span>' : 
                         '<span class="dead">Non-Live</span>';
-                    subsHtml += `<li>${sub.name} [${subStatus}]</li>`;
+                    const http = sub.http_status !== undefined ? 
+                        ` <span class="text-muted small">HTTP ${sub.http_status === null ? 'unreachable' : sub.http_status + ' in ' + sub.http_latency_ms + ' ms'}</span>` : '';
+                    subsHtml += `<li>${escapeHtml(sub.name)} [${subStatus}]${http}</li>`;
                 });
             }
             subsHtml += '</ul>';
             
             card.innerHTML = `
                 <div class="card-body">
-                    <h5 class="card-title">${domain.domain}</h5>
+                    <h5 class="card-title">${escapeHtml(domain.domain)}</h5>
                     <p><strong>Status:</strong> ${domainStatus}</p>
                     <p><strong>Subdomains:</strong></p>
                     ${subsHtml}
@@ -790,13 +3022,24 @@ def index():
             return card;
         }
         
-        function showCompletion(data) {
+        async function showCompletion(data) {
             document.getElementById('progressSection').classList.add('hidden');
             document.getElementById('completed').classList.remove('hidden');
             
-            const totalSubs = data.domains.reduce((sum, d) => sum + d.subdomains.length, 0);
-            document.getElementById('completionStats').textContent = 
-                `Scanned ${data.domains.length} domains with ${totalSubs} subdomains in record time!`;
+            let summary = { totals: { domains: data.processed_zones, subdomains: data.total_subdomains } };
+            try {
+                const response = await fetch('/api/summary');
+                summary = await response.json();
+            } catch (err) {
+                console.error('Summary error:', err);
+            }
+            const totals = summary.totals;
+            let text = `Scanned ${totals.domains} domains with ${totals.subdomains} subdomains in record time! `;
+            if (totals.live_names !== undefined) {
+                text += `${totals.live_domains} live domains, ${totals.live_subdomains} live subdomains. `;
+            }
+            document.getElementById('completionStats').textContent = text +
+                `(${data.probes_issued} probes, ${data.probes_coalesced} shared across zones)`;
         }
         
         function showError(message) {
@@ -806,15 +3049,36 @@ def index():
             document.getElementById('startBtn').disabled = false;
         }
         
+        async function cancelScan() {
+            document.getElementById('cancelBtn').disabled = true;
+            try {
+                await fetch('/api/cancel-scan', { method: 'POST' });
+            } catch (err) {
+                console.error('Cancel error:', err);
+            }
+        }
+        
+        async function checkResumable() {
+            try {
+                const response = await fetch('/api/scan-status?domains=0');
+                const data = await response.json();
+                document.getElementById('resumeBtn').classList.toggle('hidden', !data.resumable || data.status === 'scanning');
+            } catch (err) {
+                console.error('Status error:', err);
+            }
+        }
+        
         function resetScan() {
             clearInterval(scanInterval);
             isScanning = false;
-            document.getElementById('results').innerHTML = '';
+            clearResults();
+            document.getElementById('results').classList.add('hidden');
             document.getElementById('error').classList.add('hidden');
             document.getElementById('completed').classList.add('hidden');
             document.getElementById('emailSuccess').classList.add('hidden');
             document.getElementById('progressSection').classList.add('hidden');
             document.getElementById('startBtn').disabled = false;
+            document.getElementById('cancelBtn').disabled = true;
             document.getElementById('pdfBtn').disabled = true;
             document.getElementById('emailBtn').disabled = true;
         }
@@ -858,8 +3122,30 @@ def index():
             }
         });
         
-        document.getElementById('startBtn').addEventListener('click', startScan);
+        document.getElementById('startBtn').addEventListener('click', () => startScan(false));
+        document.getElementById('cancelBtn').addEventListener('click', cancelScan);
+        document.getElementById('resumeBtn').addEventListener('click', () => startScan(true));
         document.getElementById('resetBtn').addEventListener('click', resetScan);
+        document.getElementById('resultsViewport').addEventListener('scroll', scheduleRender);
+        document.getElementById('resultsRows').addEventListener('click', event => {
+            const row = event.target.closest('.result-row');
+            if (row) showDomainDetails(parseInt(row.dataset.index, 10));
+        });
+        let searchTimer = null;
+        document.getElementById('resultsSearch').addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                document.getElementById('resultsViewport').scrollTop = 0;
+                refreshResults();
+            }, 200);
+        });
+        ['resultsStatus', 'resultsSort'].forEach(id => {
+            document.getElementById(id).addEventListener('change', () => {
+                document.getElementById('resultsViewport').scrollTop = 0;
+                refreshResults();
+            });
+        });
+        checkResumable();
         document.getElementById('pdfBtn').addEventListener('click', () => {
             window.open('/api/generate-pdf', '_blank');
         });
@@ -870,38 +3156,104 @@ def index():
 
 @app.route('/api/start-scan', methods=['POST'])
 def start_scan():
-    if scan_state['status'] == 'scanning':
+    if not shared_store and scan_state['status'] == 'scanning':
         return jsonify({"error": "Scan already in progress"}), 400
     
-    thread = threading.Thread(target=background_scan)
+    data = request.get_json(silent=True) or {}
+    resume = bool(data.get('resume'))
+    if resume and not os.path.exists(CHECKPOINT_PATH):
+        return jsonify({"error": "No checkpoint to resume from"}), 400
+    
+    try:
+        scope = parse_scan_scope(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # With shared state only the worker that wins the claim runs the scan
+    if shared_store and not shared_store.claim_scan(process_id()):
+        return jsonify({"error": "Scan already in progress"}), 400
+    
+    thread = threading.Thread(target=background_scan, args=(scope, resume))
     thread.daemon = True
     thread.start()
     return jsonify({"status": "started"})
 
+@app.route('/api/cancel-scan', methods=['POST'])
+def cancel_scan():
+    if read_scan_state(include_domains=False)['status'] != 'scanning':
+        return jsonify({"error": "No scan in progress"}), 400
+    
+    # The owning worker picks the request up on its next heartbeat
+    if shared_store:
+        shared_store.set_meta({'cancel_requested': True})
+    if scan_state['status'] == 'scanning':
+        scan_cancel.set()
+    return jsonify({"status": "cancelling"})
+
 @app.route('/api/scan-status')
 def scan_status():
-    with scan_lock:
-        state_copy = {
-            'status': scan_state['status'],
-            'error': scan_state['error'],
-            'domains': scan_state['domains'].copy(),
-            'total_zones': scan_state['total_zones'],
-            'processed_zones': scan_state['processed_zones']
-        }
+    include_domains = request.args.get('domains', '1') != '0'
+    state_copy = read_scan_state(include_domains)
+    state_copy['resumable'] = os.path.exists(CHECKPOINT_PATH)
     
+    if include_domains:
+        state_copy['domains'] = [d.to_dict() for d in state_copy['domains']]
     return jsonify(state_copy)
 
+@app.route('/api/results')
+def results():
+    page = max(1, request.args.get('page', 1, type=int))
+    limit = min(500, max(1, request.args.get('limit', 50, type=int)))
+    sort = request.args.get('sort', 'name')
+    status = request.args.get('status', 'all')
+    q = request.args.get('q', '').strip()
+    
+    if sort not in RESULT_SORTS:
+        return jsonify({"error": f"sort must be one of: {', '.join(sorted(RESULT_SORTS))}"}), 400
+    if status not in RESULT_STATUSES:
+        return jsonify({"error": f"status must be one of: {', '.join(sorted(RESULT_STATUSES))}"}), 400
+    
+    if shared_store:
+        # Partial rows are only meaningful while their scan is still running
+        scanning = read_scan_state(include_domains=False)['status'] == 'scanning'
+        total, items = shared_store.query_results(q=q, status=status, sort=sort, page=page, limit=limit,
+                                                  include_pending=scanning)
+    else:
+        with scan_lock:
+            total, items = result_index.query(q=q, status=status, sort=sort, page=page, limit=limit)
+    
+    return jsonify({
+        'items': [d.summary() for d in items],
+        'total': total,
+        'page': page,
+        'limit': limit,
+        'pages': (total + limit - 1) // limit
+    })
+
+@app.route('/api/results/<path:name>')
+def result_details(name):
+    if shared_store:
+        scanning = read_scan_state(include_domains=False)['status'] == 'scanning'
+        found = shared_store.find_results(name, include_pending=scanning)
+    else:
+        with scan_lock:
+            found = result_index.find(name)
+    
+    if not found:
+        return jsonify({"error": f"No result for {name}"}), 404
+    return jsonify({'items': [d.to_dict() for d in found]})
+
 @app.route('/api/generate-pdf')
 def generate_pdf():
     try:
-        with scan_lock:
-            domains = scan_state['domains'].copy()
+        domains = snapshot_domains()
         
         if not domains:
             return jsonify({"error": "No scan data available"}), 400
         
-        pdf_path = generate_pdf_report(domains)
-        return send_file(pdf_path, as_attachment=True, download_name='route53_report_advanced.pdf')
+        pdf_data = generate_pdf_report(domains, read_scan_stats())
+        return send_file(io.BytesIO(pdf_data), mimetype='application/pdf', as_attachment=True,
+                         download_name='route53_report_advanced.pdf')
     except Exception as e:
         return jsonify({"error": f"PDF generation failed: {str(e)}"}), 500
 
@@ -914,15 +3266,14 @@ def send_email():
         if not recipient_email or '@' not in recipient_email:
             return jsonify({"error": "Invalid email address"}), 400
         
-        with scan_lock:
-            domains = scan_state['domains'].copy()
+        domains = snapshot_domains()
         
         if not domains:
             return jsonify({"error": "No scan data available"}), 400
         
-        pdf_path = generate_pdf_report(domains)
+        pdf_data = generate_pdf_report(domains, read_scan_stats())
         
-        if send_email_with_pdf(recipient_email, pdf_path):
+        if send_email_with_pdf(recipient_email, pdf_data):
             return jsonify({"success": True})
         else:
             return jsonify({"error": "Failed to send email. Check SMTP configuration."}), 500
@@ -930,7 +3281,172 @@ def send_email():
     except Exception as e:
         return jsonify({"error": f"Email sending failed: {str(e)}"}), 500
 
+@app.route('/api/summary')
+def summary():
+    stats = read_scan_stats()
+    data = read_scan_state(include_domains=False)
+    summary = {
+        'status': data['status'],
+        'total_zones': data['total_zones'],
+        'processed_zones': data['processed_zones'],
+        'probes_issued': data['probes_issued'],
+        'probes_coalesced': data['probes_coalesced'],
+        'totals': stats.totals()
+    }
+    if request.args.get('zones') == '1':
+        summary['zones'] = stats.zone_totals()
+    return jsonify(summary)
+
+def resolve_diff_ids(old_id, new_id):
+    # Defaults to the latest snapshot compared with the previous one of the same scope
+    snapshots = list_snapshots()
+    ids = [meta['id'] for meta in snapshots]
+    new_id = new_id or (ids[-1] if ids else None)
+    if not old_id and new_id in ids:
+        position = ids.index(new_id)
+        scope_key = snapshot_scope_key(snapshots[position].get('scope'))
+        old_id = next(
+            (meta['id'] for meta in reversed(snapshots[:position]) if snapshot_scope_key(meta.get('scope')) == scope_key),
+            None
+        )
+    if not old_id:
+        raise ValueError("At least two completed scans with the same scope are needed for a diff")
+    for snapshot_id in (old_id, new_id):
+        if not snapshot_exists(snapshot_id):
+            raise ValueError(f"Unknown snapshot: {snapshot_id}")
+    return old_id, new_id
+
+def diff_summary(diff):
+    return (
+        f"Changes from scan {diff['from']['id']} to {diff['to']['id']}:\n\n"
+        f"  • {len(diff['went_dead'])} names went non-live\n"
+        f"  • {len(diff['went_live'])} names went live\n"
+        f"  • {len(diff['added'])} new records\n"
+        f"  • {len(diff['removed'])} deleted records\n"
+        + (f"\nNot compared (scan errors): {', '.join(diff['skipped_zones'])}\n" if diff['skipped_zones'] else '')
+    )
+
+@app.route('/api/snapshots')
+def snapshots():
+    return jsonify({"snapshots": list_snapshots()})
+
+@app.route('/api/diff')
+def scan_diff():
+    try:
+        old_id, new_id = resolve_diff_ids(request.args.get('from'), request.args.get('to'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    diff = diff_snapshots(old_id, new_id)
+    if request.args.get('format') == 'pdf':
+        try:
+            return send_file(io.BytesIO(generate_diff_pdf(diff)), mimetype='application/pdf',
+                             as_attachment=True, download_name=f'route53_changes_{new_id}.pdf')
+        except Exception as e:
+            return jsonify({"error": f"PDF generation failed: {str(e)}"}), 500
+    
+    diff['summary'] = {key: len(diff[key]) for key in ('added', 'removed', 'went_live', 'went_dead')}
+    return jsonify(diff)
+
+@app.route('/api/send-diff-email', methods=['POST'])
+def send_diff_email():
+    try:
+        data = request.get_json() or {}
+        recipient_email = data.get('email')
+        
+        if not recipient_email or '@' not in recipient_email:
+            return jsonify({"error": "Invalid email address"}), 400
+        
+        try:
+            old_id, new_id = resolve_diff_ids(data.get('from'), data.get('to'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        diff = diff_snapshots(old_id, new_id)
+        pdf_data = generate_diff_pdf(diff)
+        body = f"Hello,\n\n{diff_summary(diff)}\nThe attached PDF lists every changed name.\n\nBest regards,\nRoute53 Domain Scanner\n"
+        
+        if send_email_with_pdf(recipient_email, pdf_data, subject="Route53 Scan Changes",
+                               body=body, filename=f'route53_changes_{new_id}.pdf'):
+            return jsonify({"success": True})
+        else:
+            return jsonify({"error": "Failed to send email. Check SMTP configuration."}), 500
+    
+    except Exception as e:
+        return jsonify({"error": f"Email sending failed: {str(e)}"}), 500
+
+@app.route('/api/monitor/start', methods=['POST'])
+def monitor_start():
+    # Monitor state lives in one process; under a multi-process server the
+    # status and events requests would land on workers that never started it
+    if shared_store:
+        return jsonify({"error": "The liveness monitor is not available when SHARED_STATE_PATH is set"}), 409
+    
+    domains = snapshot_domains()
+    
+    if not domains:
+        return jsonify({"error": "No scan data available"}), 400
+    
+    try:
+        zones = list_hosted_zones(get_route53_client())
+    except Exception as e:
+        return jsonify({"error": f"Could not list hosted zones: {str(e)}"}), 500
+    monitor.track_results(domains, zones)
+    monitor.start()
+    return jsonify(monitor.status())
+
+@app.route('/api/monitor/stop', methods=['POST'])
+def monitor_stop():
+    monitor.stop()
+    return jsonify({"status": "stopping"})
+
+@app.route('/api/monitor/status')
+def monitor_status():
+    return jsonify(monitor.status())
+
+@app.route('/api/monitor/events')
+def monitor_events():
+    since = request.args.get('since', 0, type=int)
+    return jsonify({"events": monitor.events_since(since)})
+
+@app.route('/api/worker/lease', methods=['POST'])
+def worker_lease():
+    data = request.get_json() or {}
+    return jsonify({"task": work_queue.lease(data.get('worker_id', request.remote_addr))})
+
+@app.route('/api/worker/heartbeat', methods=['POST'])
+def worker_heartbeat():
+    data = request.get_json() or {}
+    return jsonify({"ok": work_queue.heartbeat(data.get('lease_id'))})
+
+@app.route('/api/worker/complete', methods=['POST'])
+def worker_complete():
+    data = request.get_json(silent=True) or {}
+    if not data.get('lease_id') or not data.get('result'):
+        return jsonify({"error": "lease_id and result are required"}), 400
+    try:
+        result = DomainResult.from_dict(data['result'])
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        return jsonify({"error": f"Invalid result: {e}"}), 400
+    return jsonify({"ok": work_queue.complete(data['lease_id'], result)})
+
+@app.route('/api/worker/fail', methods=['POST'])
+def worker_fail():
+    data = request.get_json() or {}
+    return jsonify({"ok": work_queue.fail(data.get('lease_id'), data.get('error', 'unknown error'))})
+
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'worker':
+        if len(sys.argv) < 3:
+            print("Usage: python app.py worker <coordinator_url> [concurrency]")
+            exit(1)
+        concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else WORKER_CONCURRENCY
+        print(f"🛠  Scan worker polling {sys.argv[2]} with {concurrency} threads")
+        threads = run_worker(HttpQueueClient(sys.argv[2]), concurrency=concurrency)
+        for thread in threads:
+            thread.join()
+        exit(0)
+    
     if not USE_WEASYPRINT:
         print("❌ FATAL: WeasyPrint is required for PDF generation!")
         print("   Install it with: pip install weasyprint")
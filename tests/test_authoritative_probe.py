@@ -0,0 +1,138 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+import app
+
+pytest.importorskip('dns')
+import dns.flags
+import dns.message
+import dns.rrset
+
+
+class StubNameserver:
+    # Minimal UDP + TCP DNS server on a loopback address; `handler(query, tcp)`
+    # returns a response message, or None to drop the query
+    def __init__(self, host, port, handler):
+        self.handler = handler
+        self.queries = []
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind((host, port))
+        self.port = self.udp.getsockname()[1]
+        self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.tcp.bind((host, self.port))
+        self.tcp.listen(8)
+        for target in (self._serve_udp, self._serve_tcp):
+            threading.Thread(target=target, daemon=True).start()
+
+    def _respond(self, wire, tcp):
+        query = dns.message.from_wire(wire)
+        self.queries.append((query.question[0].name.to_text(), 'tcp' if tcp else 'udp'))
+        response = self.handler(query, tcp)
+        return response.to_wire() if response is not None else None
+
+    def _serve_udp(self):
+        while True:
+            try:
+                wire, addr = self.udp.recvfrom(65535)
+            except OSError:
+                return
+            reply = self._respond(wire, False)
+            if reply:
+                self.udp.sendto(reply, addr)
+
+    def _serve_tcp(self):
+        while True:
+            try:
+                conn, _ = self.tcp.accept()
+            except OSError:
+                return
+            with conn:
+                length = struct.unpack('!H', conn.recv(2))[0]
+                wire = b''
+                while len(wire) < length:
+                    wire += conn.recv(length - len(wire))
+                reply = self._respond(wire, True)
+                if reply:
+                    conn.sendall(struct.pack('!H', len(reply)) + reply)
+
+    def close(self):
+        self.udp.close()
+        self.tcp.close()
+
+
+def authoritative_answer(query, address='192.0.2.1'):
+    response = dns.message.make_response(query)
+    response.flags |= dns.flags.AA
+    response.answer.append(dns.rrset.from_text(query.question[0].name, 60, 'IN', 'A', address))
+    return response
+
+
+@pytest.fixture
+def stubs():
+    servers = []
+
+    def start(host, handler, port=0):
+        server = StubNameserver(host, port, handler)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_truncated_udp_answer_is_retried_over_tcp(stubs):
+    def handler(query, tcp):
+        if tcp:
+            return authoritative_answer(query)
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA | dns.flags.TC
+        return response
+
+    server = stubs('127.0.0.1', handler)
+    results = app.probe_authoritative(['big.example.com'], ['127.0.0.1'], port=server.port, timeout=1)
+
+    assert results == {'big.example.com': True}
+    assert [transport for _, transport in server.queries] == ['udp', 'tcp']
+
+
+def test_timeout_retries_rotate_to_next_nameserver(stubs):
+    silent = stubs('127.0.0.1', lambda query, tcp: None)
+    answering = stubs('127.0.0.2', lambda query, tcp: authoritative_answer(query), port=silent.port)
+
+    results = app.probe_authoritative(
+        ['www.example.com'], ['127.0.0.1', '127.0.0.2'], port=silent.port, timeout=0.3
+    )
+
+    assert results == {'www.example.com': True}
+    assert len(silent.queries) == 1
+    assert len(answering.queries) == 1
+
+
+def test_unanswered_name_is_dead_after_retries(stubs):
+    silent = stubs('127.0.0.1', lambda query, tcp: None)
+
+    results = app.probe_authoritative(['gone.example.com'], ['127.0.0.1'], port=silent.port, timeout=0.2)
+
+    assert results == {'gone.example.com': False}
+    assert len(silent.queries) == app.AUTHORITATIVE_RETRIES + 1
+
+
+def test_referral_is_followed_to_child_nameservers(stubs):
+    def parent(query, tcp):
+        response = dns.message.make_response(query)
+        response.authority.append(dns.rrset.from_text('sub.example.com.', 60, 'IN', 'NS', 'ns1.sub.example.com.'))
+        response.additional.append(dns.rrset.from_text('ns1.sub.example.com.', 60, 'IN', 'A', '127.0.0.2'))
+        return response
+
+    parent_server = stubs('127.0.0.1', parent)
+    child_server = stubs('127.0.0.2', lambda query, tcp: authoritative_answer(query), port=parent_server.port)
+
+    results = app.probe_authoritative(['sub.example.com'], ['127.0.0.1'], port=parent_server.port, timeout=1)
+
+    assert results == {'sub.example.com': True}
+    assert child_server.queries == [('sub.example.com.', 'udp')]
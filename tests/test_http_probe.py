@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import app
+
+pytest.importorskip('aiohttp')
+
+RESPONSE_DELAY = 0.5
+
+
+class SlowServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('0.0.0.0', 0), SlowHandler)
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+        time.sleep(RESPONSE_DELAY)
+        with self.server.lock:
+            self.server.active -= 1
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    server = SlowServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    monkeypatch.setattr(app, 'HTTP_PROBE_SCHEMES', ('http',))
+    monkeypatch.setattr(app, 'HTTP_PROBE_CONCURRENCY', 5)
+    monkeypatch.setattr(app, 'HTTP_PROBE_CONNECT_TIMEOUT', 1)
+    monkeypatch.setattr(app, 'HTTP_PROBE_TIMEOUT', 1.5)
+
+
+def test_saturated_pool_does_not_time_out_reachable_hosts(slow_server, small_pool):
+    # 30 distinct destinations through a 5-connection pool take ~3 s in total,
+    # twice the per-request timeout; none of them may be reported unreachable
+    port = slow_server.server_address[1]
+    names = [f"127.0.0.{i}:{port}" for i in range(1, 31)]
+
+    results = asyncio.run(app.http_probe_names(names))
+
+    assert sorted(results) == sorted(names)
+    assert all(status == 200 for status, _ in results.values())
+    assert slow_server.peak <= 5
+
+
+def test_closed_port_is_unreachable(small_pool):
+    with ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler) as server:
+        port = server.server_address[1]
+
+    results = asyncio.run(app.http_probe_names([f"127.0.0.1:{port}"]))
+
+    assert results == {f"127.0.0.1:{port}": (None, None)}
+
+
+def test_cancel_stops_remaining_probes(slow_server, small_pool):
+    port = slow_server.server_address[1]
+    names = [f"127.0.0.{i}:{port}" for i in range(1, 31)]
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+
+    started = time.time()
+    results = asyncio.run(app.http_probe_names(names, cancel=cancel))
+
+    assert time.time() - started < 2
+    assert len(results) < len(names)
@@ -0,0 +1,49 @@
+import time
+
+import app
+
+PUBLIC = {'Id': '/hostedzone/ZPUB', 'Name': 'example.com.'}
+PRIVATE = {'Id': '/hostedzone/ZPRIV', 'Name': 'example.com.', 'Config': {'PrivateZone': True}}
+
+
+def run_monitor(monitor, seconds=0.6):
+    monitor.start()
+    time.sleep(seconds)
+    monitor.stop()
+
+
+def test_probe_errors_do_not_emit_change_events(monkeypatch):
+    def failing_probe(name, zone):
+        raise RuntimeError('throttled')
+
+    monitor = app.LivenessMonitor(probe=failing_probe, workers=2)
+    monkeypatch.setattr(app, 'MONITOR_MIN_INTERVAL', 0.1)
+    monitor.track_results([app.DomainResult('example.com', True, zone_id=PUBLIC['Id'])], [PUBLIC])
+    run_monitor(monitor)
+
+    assert monitor.events_since(0) == []
+
+
+def test_split_horizon_zones_are_tracked_and_probed_separately(monkeypatch):
+    calls = set()
+
+    def probe(name, zone):
+        calls.add((name, zone['Id']))
+        return zone is PRIVATE
+
+    monitor = app.LivenessMonitor(probe=probe, workers=2)
+    monkeypatch.setattr(app, 'MONITOR_MIN_INTERVAL', 0.1)
+    monitor.track_results([
+        app.DomainResult('example.com', True, [('db.example.com', True)], zone_id=PRIVATE['Id']),
+        app.DomainResult('example.com', False, zone_id=PUBLIC['Id'])
+    ], [PUBLIC, PRIVATE])
+    run_monitor(monitor)
+
+    assert ('db.example.com', PRIVATE['Id']) in calls
+    assert ('db.example.com', PUBLIC['Id']) not in calls
+    assert monitor.events_since(0) == []
+
+    # A rescan of the private zone only retires that zone's deleted names
+    monitor.track_results([app.DomainResult('example.com', True, zone_id=PRIVATE['Id'])],
+                          [PRIVATE], replace={PRIVATE['Id']})
+    assert monitor.status()['tracked'] == 2
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+import app
+
+
+def answer(live):
+    return lambda names: {name: live for name in names}
+
+
+def test_concurrent_callers_share_one_probe():
+    table = app.ProbeTable()
+    release = threading.Event()
+    probed = []
+
+    def slow_probe(names):
+        probed.extend(names)
+        release.wait(2)
+        return {name: True for name in names}
+
+    owner = threading.Thread(target=table.resolve, args=(['sub.example.com'], slow_probe))
+    owner.start()
+    time.sleep(0.05)
+    results = {}
+    waiter = threading.Thread(target=lambda: results.update(table.resolve(['SUB.example.com'], answer(False))))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join()
+    waiter.join()
+
+    assert probed == ['sub.example.com']
+    assert results == {'SUB.example.com': True}
+    assert (table.issued, table.coalesced) == (1, 1)
+
+
+def test_answers_are_not_shared_across_sources():
+    table = app.ProbeTable()
+
+    assert table.resolve(['www.example.com'], answer(True), 'authoritative') == {'www.example.com': True}
+    assert table.resolve(['www.example.com'], answer(False), 'resolver') == {'www.example.com': False}
+    assert table.resolve(['www.example.com'], answer(False), 'authoritative') == {'www.example.com': True}
+    assert (table.issued, table.coalesced) == (2, 1)
+
+
+def test_entries_expire_after_share_window():
+    table = app.ProbeTable(share_seconds=0.1)
+    table.resolve(['www.example.com'], answer(True))
+
+    time.sleep(0.15)
+    assert table.resolve(['www.example.com'], answer(False)) == {'www.example.com': False}
+
+    # The periodic sweep drops entries nobody asked for again
+    table.resolve(['other.example.com'], answer(True))
+    time.sleep(0.15)
+    table.resolve(['third.example.com'], answer(True))
+    assert ('other.example.com', None) not in table._entries
+
+
+def test_waiters_probe_again_when_owner_fails():
+    table = app.ProbeTable()
+    release = threading.Event()
+
+    def cancelled_probe(names):
+        release.wait(2)
+        raise app.ScanCancelled()
+
+    def run_owner():
+        with pytest.raises(app.ScanCancelled):
+            table.resolve(['www.example.com'], cancelled_probe)
+
+    owner = threading.Thread(target=run_owner)
+    owner.start()
+    time.sleep(0.05)
+    results = {}
+    waiter = threading.Thread(target=lambda: results.update(table.resolve(['www.example.com'], answer(True))))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join()
+    waiter.join()
+
+    assert results == {'www.example.com': True}
+    # The failed probe is not remembered as a dead answer
+    assert table.resolve(['www.example.com'], answer(False)) == {'www.example.com': True}
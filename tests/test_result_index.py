@@ -0,0 +1,22 @@
+import app
+
+
+def make_result(domain, live, count):
+    return app.DomainResult(domain, live, [(f'h{i}.{domain}', True) for i in range(count)])
+
+
+def test_subdomain_sort_uses_index_and_tracks_removals():
+    index = app.ResultIndex()
+    small = make_result('b.com', True, 1)
+    large = make_result('a.com', False, 5)
+    tied = make_result('c.com', True, 5)
+    for result in (small, large, tied):
+        index.add(result)
+
+    assert index.query(sort='subdomains') == (3, [large, tied, small])
+    assert index.query(sort='subdomains', status='live') == (2, [tied, small])
+    assert index.query(q='c.', sort='subdomains') == (1, [tied])
+
+    index.remove(large)
+    assert index.query(sort='subdomains') == (2, [tied, small])
+    assert index.query(sort='subdomains', limit=1, page=2) == (2, [small])
@@ -0,0 +1,51 @@
+import pytest
+
+import app
+
+
+ZONES = {
+    'Z1': ['example.com.', 'www.example.com.', 'sub.example.com.'],
+    'Z2': ['sub.example.com.', 'api.sub.example.com.'],
+    'Z3': ['other.org.', 'www.other.org.']
+}
+
+
+@pytest.fixture
+def local_scan(monkeypatch):
+    table = app.ProbeTable()
+    probed = []
+
+    def probe(names):
+        probed.extend(names)
+        return {name: not name.startswith('www.') for name in names}
+
+    monkeypatch.setattr(app, 'probe_table', table)
+    monkeypatch.setattr(app, 'result_index', app.ResultIndex())
+    monkeypatch.setattr(app, 'scan_stats', app.ScanStats())
+    monkeypatch.setattr(app, 'shared_store', None)
+    monkeypatch.setitem(app.scan_state, 'domains', [])
+    monkeypatch.setitem(app.scan_state, 'processed_zones', 0)
+    monkeypatch.setattr(app, 'get_route53_client', lambda: None)
+    monkeypatch.setattr(app, 'iter_record_pages',
+                        lambda zone, client: iter([[{'Name': name, 'Type': 'A'} for name in ZONES[zone['Id']]]]))
+    monkeypatch.setattr(app, 'probe_names',
+                        lambda zone, names, client, cancel=None, shared=True: table.resolve(names, probe, 'resolver'))
+    app.scan_cancel.clear()
+    return table, probed
+
+
+def test_apex_is_probed_once_per_zone(local_scan):
+    table, probed = local_scan
+    zones = [{'Id': zone_id, 'Name': names[0], 'ResourceRecordSetCount': len(names)}
+             for zone_id, names in ZONES.items()]
+
+    app.scan_zones_local(zones)
+
+    results = {d.domain: d for d in app.scan_state['domains']}
+    assert sorted(results) == ['example.com', 'other.org', 'sub.example.com']
+    assert results['sub.example.com'].live is True
+    assert sorted(results['example.com'].iter_subdomains()) == [('sub.example.com', True), ('www.example.com', False)]
+    assert sorted(probed) == sorted(set(probed))
+    # Only sub.example.com is shared, between the parent zone and its own apex
+    assert table.coalesced == 1
+    assert app.result_index.query()[0] == 3
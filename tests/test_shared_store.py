@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = app.SharedScanStore(str(tmp_path / 'shared.db'))
+    monkeypatch.setattr(app, 'shared_store', store)
+    store.add_result(app.DomainResult('done.com', True, [('www.done.com', True)]), {'processed_zones': 1})
+    store.add_partial(app.DomainResult('half.com', True, pending=True))
+    return store
+
+
+def result_names(client, path='/api/results'):
+    return [item['domain'] for item in client.get(path).get_json()['items']]
+
+
+def test_pending_rows_are_listed_while_owner_is_alive(store):
+    store.set_meta({'status': 'scanning', 'owner_heartbeat': time.time()})
+    client = app.app.test_client()
+
+    assert result_names(client) == ['done.com', 'half.com']
+    assert client.get('/api/results/half.com').status_code == 200
+
+
+def test_pending_rows_of_dead_owner_are_hidden(store):
+    store.set_meta({'status': 'scanning', 'owner_heartbeat': time.time() - app.SCAN_OWNER_TIMEOUT - 1})
+    client = app.app.test_client()
+
+    assert result_names(client) == ['done.com']
+    assert client.get('/api/results/half.com').status_code == 404
+
+
+def test_claiming_a_scan_clears_pending_rows(store):
+    store.set_meta({'status': 'scanning', 'owner_heartbeat': time.time() - app.SCAN_OWNER_TIMEOUT - 1})
+
+    assert store.claim_scan('new-owner')
+    assert [d.domain for d in store.query_results()[1]] == ['done.com']
@@ -0,0 +1,91 @@
+import itertools
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    # Snapshot ids sort by creation time; hand out one timestamp per snapshot
+    stamps = (f"20260101-0000{second:02d}" for second in itertools.count())
+    monkeypatch.setattr(app, 'SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.setattr(app.time, 'strftime', lambda fmt, *args: next(stamps))
+    return tmp_path
+
+
+def scope(**data):
+    return app.parse_scan_scope(data)
+
+
+def result(domain, live, subdomains=()):
+    return app.DomainResult(domain, live, subdomains)
+
+
+def test_diff_finds_added_removed_and_flipped_names(snapshot_dir):
+    old = app.save_snapshot([
+        result('example.com', True, [('www.example.com', True), ('old.example.com', True), ('api.example.com', False)])
+    ])
+    new = app.save_snapshot([
+        result('example.com', True, [('www.example.com', False), ('new.example.com', True), ('api.example.com', True)])
+    ])
+
+    diff = app.diff_snapshots(old['id'], new['id'])
+
+    assert diff['added'] == [{'name': 'new.example.com', 'live': True}]
+    assert diff['removed'] == [{'name': 'old.example.com', 'live': True}]
+    assert diff['went_live'] == ['api.example.com']
+    assert diff['went_dead'] == ['www.example.com']
+
+
+def test_identical_snapshots_have_no_changes(snapshot_dir):
+    domains = [result('example.com', True, [('www.example.com', True)])]
+    old = app.save_snapshot(domains)
+    new = app.save_snapshot(domains)
+
+    assert old['hash'] == new['hash']
+    diff = app.diff_snapshots(old['id'], new['id'])
+    assert diff['added'] == diff['removed'] == diff['went_live'] == diff['went_dead'] == []
+
+
+def test_names_in_failed_zones_are_not_reported_missing(snapshot_dir):
+    old = app.save_snapshot([
+        result('example.com', True, [('www.example.com', True)]),
+        result('other.org', True, [('www.other.org', True)])
+    ])
+    new = app.save_snapshot([result('example.com', True)], failed_zones=[{'Id': 'Z2', 'Name': 'other.org.'}])
+
+    diff = app.diff_snapshots(old['id'], new['id'])
+
+    assert diff['removed'] == [{'name': 'www.example.com', 'live': True}]
+    assert diff['skipped_zones'] == ['other.org']
+
+
+def test_in_failed_zone_matches_whole_labels():
+    failed = {'example.com'}
+    assert app.in_failed_zone('example.com', failed)
+    assert app.in_failed_zone('a.b.example.com', failed)
+    assert not app.in_failed_zone('badexample.com', failed)
+    assert not app.in_failed_zone('example.com.au', failed)
+
+
+def test_default_diff_uses_previous_snapshot_with_same_scope(snapshot_dir):
+    full = app.save_snapshot([result('example.com', True)], scope(zone_ids='Z1,Z2', record_types='A,CNAME'))
+    app.save_snapshot([result('other.org', True)], scope(zone_ids='Z3'))
+    latest = app.save_snapshot([result('example.com', False)], scope(zone_ids='Z2,Z1', record_types='CNAME,A'))
+
+    assert app.resolve_diff_ids(None, None) == (full['id'], latest['id'])
+
+
+def test_default_diff_needs_a_same_scope_snapshot(snapshot_dir):
+    app.save_snapshot([result('example.com', True)], scope(zone_ids='Z1'))
+    app.save_snapshot([result('example.com', True)], scope(zone_ids='Z2'))
+
+    with pytest.raises(ValueError):
+        app.resolve_diff_ids(None, None)
+
+
+def test_scope_key_ignores_list_order_and_http_probe():
+    assert app.snapshot_scope_key(scope(zone_patterns='b.*,a.*', http_probe=True)) == \
+        app.snapshot_scope_key(scope(zone_patterns='a.*,b.*', http_probe=False))
+    assert app.snapshot_scope_key(None) == app.snapshot_scope_key(scope())
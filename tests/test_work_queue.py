@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+
+import pytest
+
+import app
+
+
+def make_zone(zone_id):
+    return {'Id': f'/hostedzone/{zone_id}', 'Name': f'{zone_id.lower()}.example.com.'}
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_queue(request, tmp_path):
+    def factory(lease_seconds=0.2, max_attempts=3):
+        if request.param == 'memory':
+            return app.ZoneWorkQueue(lease_seconds=lease_seconds, max_attempts=max_attempts)
+        store = app.SharedScanStore(str(tmp_path / 'state.db'))
+        return app.SqliteWorkQueue(store, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    return factory
+
+
+def expire(work_queue):
+    time.sleep(work_queue.lease_seconds + 0.05)
+    work_queue.requeue_expired()
+
+
+def test_expired_lease_is_reassigned(make_queue):
+    work_queue = make_queue()
+    work_queue.put([make_zone('Z1')])
+
+    first = work_queue.lease('worker-a')
+    assert first['zone']['Id'] == '/hostedzone/Z1'
+    assert work_queue.lease('worker-b') is None
+
+    expire(work_queue)
+    assert not work_queue.heartbeat(first['lease_id'])
+
+    second = work_queue.lease('worker-b')
+    assert second['zone']['Id'] == '/hostedzone/Z1'
+    assert second['lease_id'] != first['lease_id']
+    assert work_queue.heartbeat(second['lease_id'])
+
+
+def test_duplicate_complete_keeps_first_result(make_queue):
+    work_queue = make_queue()
+    work_queue.put([make_zone('Z1')])
+
+    first = work_queue.lease('worker-a')
+    expire(work_queue)
+    second = work_queue.lease('worker-b')
+
+    # The worker whose lease expired still reports first and wins
+    assert work_queue.complete(first['lease_id'], app.DomainResult('z1.example.com', True))
+    assert not work_queue.complete(second['lease_id'], app.DomainResult('z1.example.com', False))
+
+    zone_id, result, error = work_queue.get_result(timeout=1)
+    assert zone_id == '/hostedzone/Z1'
+    assert result.live and error is None
+    with pytest.raises(queue.Empty):
+        work_queue.get_result(timeout=0.3)
+
+
+def test_zone_fails_after_max_expired_leases(make_queue):
+    work_queue = make_queue(max_attempts=2)
+    work_queue.put([make_zone('Z1')])
+
+    for _ in range(2):
+        assert work_queue.lease('worker-a') is not None
+        expire(work_queue)
+
+    assert work_queue.lease('worker-a') is None
+    zone_id, result, error = work_queue.get_result(timeout=1)
+    assert zone_id == '/hostedzone/Z1'
+    assert result is None and 'expired' in error
+
+
+def test_lost_lease_aborts_worker(monkeypatch):
+    calls = []
+
+    class LostLeaseClient:
+        def heartbeat(self, lease_id):
+            return False
+
+        def complete(self, lease_id, result):
+            calls.append('complete')
+
+        def fail(self, lease_id, error):
+            calls.append('fail')
+
+    def slow_scan(zone, scope=None, client=None, cancel=None):
+        cancel.wait(10)
+        raise app.ScanCancelled()
+
+    monkeypatch.setattr(app, 'scan_single_domain', slow_scan)
+    task = {'lease_id': 'lease-1', 'zone': make_zone('Z1'), 'scope': None, 'lease_seconds': 0.3}
+
+    started = time.time()
+    app.process_leased_zone(LostLeaseClient(), task)
+    assert time.time() - started < 5
+    assert calls == []
+
+
+def test_unreachable_coordinator_does_not_kill_worker(monkeypatch):
+    leases = []
+
+    class DownCoordinator:
+        def lease(self, worker_id):
+            leases.append(worker_id)
+            return {'lease_id': f'lease-{len(leases)}', 'zone': make_zone('Z1'), 'scope': None, 'lease_seconds': 60}
+
+        def heartbeat(self, lease_id):
+            raise OSError('coordinator unreachable')
+
+        def complete(self, lease_id, result):
+            raise OSError('coordinator unreachable')
+
+        def fail(self, lease_id, error):
+            raise AssertionError('a failed complete must not be reported as a failure')
+
+    monkeypatch.setattr(app, 'scan_single_domain',
+                        lambda zone, scope=None, client=None, cancel=None: app.DomainResult('z1.example.com', True))
+    stop = threading.Event()
+    threads = app.run_worker(DownCoordinator(), worker_id='w', concurrency=1, stop_event=stop)
+    time.sleep(0.3)
+    stop.set()
+
+    assert len(leases) > 1
+    threads[0].join(2)
+
+
+def test_worker_complete_requires_result():
+    client = app.app.test_client()
+
+    response = client.post('/api/worker/complete', json={'lease_id': 'lease-1'})
+
+    assert response.status_code == 400